@@ -0,0 +1,141 @@
+"""Load/save time and file size of each sheet file format.
+
+Saves and loads a small sheet, a large one and a folder of character
+snapshots in every format digimon_io supports, and as members of a single
+campaign bundle, and prints how each compares with the usual
+pretty-printed ".json":
+
+    python benchmarks/bench_formats.py
+    python benchmarks/bench_formats.py --snapshots 2000 --output formats.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import digimon_bundle
+import digimon_io
+from bench_sheets import large_sheet, sample_sheet, summarize, time_runs
+
+
+def snapshot_sheets(count):
+    # A campaign's worth of saves of one character, a little different each time
+    sheets = []
+    for i in range(count):
+        sheet = sample_sheet()
+        sheet["name"] = f"Snapshot {i}"
+        sheet["bonus_dp_var"] = i % 20
+        sheet["stats"]["acc_dp"] = i % 7
+        sheets.append(sheet)
+    return sheets
+
+
+def bench_format(file_format, data_sets, folder, repeat):
+    # {data set: {"save": summary, "load": summary, "bytes": size on disk}}
+    results = {}
+    for label, sheets in data_sets.items():
+        paths = [os.path.join(folder, f"{label}_{i}{file_format.suffix}") for i in range(len(sheets))]
+
+        def save_all():
+            for path, sheet in zip(paths, sheets):
+                digimon_io.write_sheet_file(path, sheet)
+
+        def load_all():
+            for path in paths:
+                digimon_io.read_sheet_file(path)
+
+        save = time_runs(save_all, repeat)
+        load = time_runs(load_all, repeat)
+        results[label] = {
+            "save": summarize(save),
+            "load": summarize(load),
+            "bytes": sum(os.path.getsize(path) for path in paths),
+        }
+    return results
+
+
+def bench_bundle(data_sets, folder, repeat):
+    # Same as bench_format, with every sheet a member of one bundle file.
+    # Each save appends a version, so the size is measured after compacting.
+    results = {}
+    for label, sheets in data_sets.items():
+        bundle_path = os.path.join(folder, label + digimon_bundle.BUNDLE_SUFFIX)
+        paths = [digimon_bundle.member_path(bundle_path, f"{label}_{i}") for i in range(len(sheets))]
+
+        def save_all():
+            for path, sheet in zip(paths, sheets):
+                digimon_io.write_sheet_file(path, sheet)
+
+        def load_all():
+            for path in paths:
+                digimon_io.read_sheet_file(path)
+
+        save = time_runs(save_all, repeat)
+        load = time_runs(load_all, repeat)
+        bundle = digimon_bundle.open_bundle(bundle_path)
+        if bundle.compacting is not None:
+            bundle.compacting.join()
+        bundle.compact()
+        results[label] = {
+            "save": summarize(save),
+            "load": summarize(load),
+            "bytes": os.path.getsize(bundle_path),
+        }
+        bundle.close()
+    return results
+
+
+def print_table(results):
+    baseline = results[digimon_io.DEFAULT_FORMAT.name]
+    for label in baseline:
+        print(f"\n{label}")
+        print(f"  {'format':10} {'size':>12} {'ratio':>7} {'save ms':>10} {'load ms':>10}")
+        for name, by_label in results.items():
+            entry = by_label[label]
+            ratio = entry["bytes"] / baseline[label]["bytes"]
+            print(f"  {name:10} {entry['bytes']:12,d} {ratio:7.2f} "
+                  f"{entry['save']['median_ms']:10.3f} {entry['load']['median_ms']:10.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare sheet file formats by load/save time and size.")
+    parser.add_argument("--repeat", type=int, default=10, help="runs per benchmark")
+    parser.add_argument("--snapshots", type=int, default=500, help="sheets in the snapshot archive")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    data_sets = {
+        "small": [sample_sheet()],
+        "large": [large_sheet()],
+        f"archive_{args.snapshots}": snapshot_sheets(args.snapshots),
+    }
+
+    results = {}
+    for file_format in reversed(digimon_io.SHEET_FORMATS):
+        with tempfile.TemporaryDirectory() as folder:
+            results[file_format.name] = bench_format(file_format, data_sets, folder, args.repeat)
+    with tempfile.TemporaryDirectory() as folder:
+        results["bundle"] = bench_bundle(data_sets, folder, args.repeat)
+
+    print_table(results)
+
+    if args.output:
+        report = {
+            "time": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+"""Benchmarks for the character sheet lifecycle.
+
+Times the operations that make the app feel fast or slow and stores the
+results as JSON, optionally checking them against an earlier run:
+
+    xvfb-run -a python benchmarks/bench_sheets.py --output bench.json
+    python benchmarks/bench_sheets.py --mode model --baseline bench.json
+
+"gui" mode drives the real app (it needs a display; use xvfb-run on a
+headless machine): startup to the first idle, new_sheet, open_sheet on a
+small and a large file, create_character_form, a single-field edit round
+trip, change_theme with N sheets open and save_data_to_file. "model" mode
+times the Tk-free parts of the same operations (the stat engine, the
+character model and sheet file I/O) and runs anywhere. "auto", the
+default, picks gui when a display is available.
+
+With --baseline, any benchmark whose median is more than --threshold
+(default 20%) slower than in the baseline fails the run (exit status 1).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import digimon_io
+import digimon_stats
+from digimon_model import Character
+
+THEMES = ["Agumon", "Gabumon", "Guilmon", "Terriermon", "Tsukaimon", "Sunarizamon"]
+
+
+def sample_sheet():
+    # Same layout new_sheet creates, with some DP spent
+    return {
+        "name": "Tai", "digimon": "Agumon", "stage": "Adult", "size": "Medium",
+        "attribute": "Vaccine", "type": "Reptile",
+        "wound_boxes": 0, "temp_boxes": 0, "battery": 0,
+        "stats": {f"{stat}_{kind}": 2 for stat in digimon_stats.STAT_KEYS for kind in ("dp", "bonus")},
+        "derived_stats": {f"{stat}_bonus": 0 for stat in digimon_stats.DERIVED_KEYS},
+        "misc_stats": {f"{stat}_bonus": 0 for stat in digimon_stats.MISC_KEYS},
+        "qualities": "Data Optimization (Close Combat)\n",
+        "attacks": [{"name": "Pepper Breath", "accuracy": 0, "type": "Ranged", "damage": 0,
+                     "tags": ["Fire", "", ""]}],
+        "effects": [{"eff_name": "", "potency": 0, "duration": 0}],
+        "bonus_dp_var": 5, "quality_spent_var": 3, "stat_spent_var": 10,
+        "dp_spent_var": 13, "dp_allocated_var": 25,
+    }
+
+
+def large_sheet(rows=200):
+    sheet = sample_sheet()
+    sheet["qualities"] = "Quality description text. " * 2000
+    sheet["attacks"] = [{"name": f"Attack {i}", "accuracy": i % 5, "type": "Melee", "damage": i % 7,
+                         "tags": [f"Tag {i}", "", ""]} for i in range(rows)]
+    sheet["effects"] = [{"eff_name": f"Effect {i}", "potency": i % 3, "duration": i % 4}
+                        for i in range(rows)]
+    return sheet
+
+
+def time_runs(func, repeat, setup=None, teardown=None):
+    # Milliseconds per run; setup/teardown are not timed
+    samples = []
+    for i in range(repeat):
+        state = setup(i) if setup else None
+        started = time.perf_counter()
+        result = func(state) if setup else func()
+        samples.append((time.perf_counter() - started) * 1000)
+        if teardown:
+            teardown(state if setup else result)
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "min_ms": ordered[0],
+        "median_ms": statistics.median(ordered),
+        "mean_ms": statistics.mean(ordered),
+        "p95_ms": ordered[int(0.95 * (len(ordered) - 1))],
+    }
+
+
+def write_sample_files(folder):
+    paths = {"small": os.path.join(folder, "small.json"), "large": os.path.join(folder, "large.json")}
+    digimon_io.write_sheet_file(paths["small"], sample_sheet())
+    digimon_io.write_sheet_file(paths["large"], large_sheet())
+    return paths
+
+
+def run_model(args, folder):
+    paths = write_sample_files(folder)
+    results = {}
+
+    def new_sheet():
+        character = Character.from_dict(sample_sheet())
+        digimon_stats.compute_stats(character.to_dict())
+    results["new_sheet"] = time_runs(new_sheet, args.repeat)
+
+    for size, path in paths.items():
+        results[f"open_sheet_{size}"] = time_runs(
+            lambda: Character.from_dict(digimon_io.load_sheet_file(path)), args.repeat
+        )
+
+    graph = digimon_stats.StatGraph()
+    graph.update(digimon_stats.character_inputs(sample_sheet()))
+    results["single_field_edit"] = time_runs(lambda value: graph.update({"acc_dp": value}),
+                                             args.repeat, setup=lambda i: str(i % 10))
+
+    character = Character.from_dict(sample_sheet())
+    save_path = os.path.join(folder, "save.json")
+
+    def save(i):
+        # A different value every run, so the digest check never skips the write
+        character.bonus_dp_var = i
+        return character
+    results["save_data_to_file"] = time_runs(
+        lambda character: digimon_io.write_sheet_file(save_path, character.to_dict()),
+        args.repeat, setup=save
+    )
+    return results
+
+
+def run_gui(args, folder):
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
+
+    from digimon_2e_latest_version import DigimonDNDApp
+
+    # Dialogs would block the run
+    messagebox.showinfo = lambda *a, **k: "ok"
+    messagebox.showerror = lambda *a, **k: "ok"
+    paths = write_sample_files(folder)
+    results = {}
+
+    def startup():
+        root = tk.Tk()
+        app = DigimonDNDApp(root)
+        root.update()
+        return root, app
+    results["startup"] = time_runs(startup, max(1, args.repeat // 4), teardown=lambda pair: pair[0].destroy())
+
+    root, app = startup()
+    app.max_materialized_sheets = max(app.max_materialized_sheets, args.theme_sheets)
+
+    def current_sheet():
+        return app.open_sheets.by_tab(app.notebook.select())
+
+    def new_sheet():
+        app.new_sheet()
+        root.update_idletasks()
+    results["new_sheet"] = time_runs(new_sheet, args.repeat,
+                                     teardown=lambda _: app.remove_sheet(current_sheet()))
+
+    for size, path in paths.items():
+        filedialog.askopenfilename = lambda *a, path=path, **k: path
+
+        def open_sheet():
+            app.open_sheet()
+            root.update_idletasks()
+        results[f"open_sheet_{size}"] = time_runs(open_sheet, args.repeat,
+                                                  teardown=lambda _: app.remove_sheet(current_sheet()))
+
+    def destroy_form(state):
+        frame, view = state
+        view["lifecycle"].close()
+        frame.destroy()
+
+    for size, data in (("small", sample_sheet()), ("large", large_sheet())):
+        character = Character.from_dict(data)
+
+        def build_form(state, character=character):
+            state.append(app.create_character_form(state[0], character))
+            root.update_idletasks()
+        results[f"create_character_form_{size}"] = time_runs(
+            build_form, args.repeat, setup=lambda i: [tk.Frame(root)], teardown=destroy_form
+        )
+
+    # Single edit: set a DP box and let the idle loop run the recalculation
+    app.new_sheet()
+    root.update()
+    sheet_info = current_sheet()
+    dp_var = next(var for field, var in sheet_info["view"]["field_vars"] if field == "stats")
+
+    def apply_edit(value):
+        dp_var.set(value)
+        root.update_idletasks()
+    results["single_field_edit"] = time_runs(apply_edit, args.repeat, setup=lambda i: str(i % 10))
+
+    save_path = os.path.join(folder, "save.json")
+
+    def change_before_save(i):
+        # Something to write every run
+        dp_var.set(str(i % 10))
+        root.update_idletasks()
+    results["save_data_to_file"] = time_runs(lambda _: app.save_data_to_file(save_path, sheet_info),
+                                             args.repeat, setup=change_before_save)
+    app.remove_sheet(sheet_info)
+
+    # Theme switch with N built sheets
+    for _ in range(args.theme_sheets):
+        app.new_sheet()
+        root.update()
+    themes = iter(THEMES * args.repeat)
+
+    def change_theme():
+        app.change_theme(next(themes))
+        root.update_idletasks()
+    results[f"change_theme_{args.theme_sheets}_sheets"] = time_runs(change_theme, args.repeat)
+
+    root.destroy()
+    return results
+
+
+def display_available():
+    import tkinter as tk
+    try:
+        tk.Tk().destroy()
+    except tk.TclError:
+        return False
+    return True
+
+
+def check_regressions(results, baseline, threshold):
+    # Names of benchmarks whose median got slower than baseline * (1 + threshold)
+    regressions = []
+    for name, summary in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before and summary["median_ms"] > before["median_ms"] * (1 + threshold):
+            regressions.append((name, before["median_ms"], summary["median_ms"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the character sheet lifecycle.")
+    parser.add_argument("--mode", choices=["auto", "gui", "model"], default="auto")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per benchmark")
+    parser.add_argument("--theme-sheets", type=int, default=8, help="sheets open for change_theme")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="earlier results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown against the baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    mode = args.mode
+    if mode == "auto":
+        mode = "gui" if display_available() else "model"
+
+    with tempfile.TemporaryDirectory() as folder:
+        samples = run_gui(args, folder) if mode == "gui" else run_model(args, folder)
+
+    results = {name: summarize(runs) for name, runs in samples.items()}
+    report = {
+        "mode": mode,
+        "time": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    for name, summary in results.items():
+        print(f"{name:34} median {summary['median_ms']:9.3f} ms   p95 {summary['p95_ms']:9.3f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=4)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline.get("mode") != mode:
+            print(f"Baseline was recorded in {baseline.get('mode')} mode, not {mode}", file=sys.stderr)
+            return 1
+        regressions = check_regressions(results, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.3f} ms -> {after:.3f} ms")
+        if regressions:
+            return 1
+        print(f"No regressions over {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
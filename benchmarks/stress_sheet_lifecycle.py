@@ -0,0 +1,90 @@
+"""Stress test for sheet cleanup.
+
+Opens and closes 1,000 character sheets (hibernating and rebuilding each
+form once on the way) and checks that the number of Tcl commands, Tcl
+global variables and Python allocations stays flat. Exits with status 1
+if anything grows past the allowed slack.
+
+    python benchmarks/stress_sheet_lifecycle.py
+    xvfb-run python benchmarks/stress_sheet_lifecycle.py --sheets 200
+
+Needs a display, so run it under xvfb-run on a headless machine.
+"""
+import argparse
+import gc
+import os
+import sys
+import tkinter as tk
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from digimon_2e_latest_version import DigimonDNDApp
+
+
+def measure(root):
+    gc.collect()
+    root.update()
+    return {
+        "tcl_commands": len(root.tk.call("info", "commands")),
+        "tcl_globals": len(root.tk.call("info", "globals")),
+        "python_bytes": tracemalloc.get_traced_memory()[0],
+    }
+
+
+def open_and_close(app):
+    app.new_sheet()
+    sheet_info = app.open_sheets.by_tab(app.notebook.select())
+    app.root.update()
+
+    # Unload and rebuild the form, as switching between many tabs does
+    app.hibernate_sheet(sheet_info)
+    app.materialize_sheet(sheet_info)
+    app.root.update()
+
+    app.remove_sheet(sheet_info)
+    app.root.update()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sheets", type=int, default=1000, help="number of sheets to open and close")
+    parser.add_argument("--warmup", type=int, default=50, help="sheets opened before the baseline is taken")
+    parser.add_argument("--max-commands", type=int, default=10, help="allowed growth in Tcl commands")
+    parser.add_argument("--max-globals", type=int, default=10, help="allowed growth in Tcl global variables")
+    parser.add_argument("--max-bytes", type=int, default=1024 * 1024, help="allowed growth in Python memory")
+    args = parser.parse_args(argv)
+
+    root = tk.Tk()
+    app = DigimonDNDApp(root)
+
+    tracemalloc.start()
+    for _ in range(args.warmup):
+        open_and_close(app)
+    before = measure(root)
+
+    for _ in range(args.sheets):
+        open_and_close(app)
+    after = measure(root)
+    tracemalloc.stop()
+    root.destroy()
+
+    limits = {
+        "tcl_commands": args.max_commands,
+        "tcl_globals": args.max_globals,
+        "python_bytes": args.max_bytes,
+    }
+    failed = False
+    for key, limit in limits.items():
+        growth = after[key] - before[key]
+        status = "ok" if growth <= limit else "FAIL"
+        failed = failed or growth > limit
+        print(f"{status:4}  {key}: {before[key]} -> {after[key]} ({growth:+d}, limit {limit:+d})")
+
+    print(f"{args.sheets} sheets opened and closed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
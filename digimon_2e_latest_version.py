@@ -1,20 +1,23 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import json
-import math
+import logging
 import os
-import sys
-
-def resource_path(relative_path):
-    """ Get absolute path to resource, works for dev and for PyInstaller """
-    try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-
-    return os.path.join(base_path, relative_path)
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 
+import digimon_io
+import digimon_stats
+from digimon_metrics import configure_logging, log, metrics
+from digimon_model import SCHEMA_VERSION, SHEET_FIELDS, Attack, Character, Effect
+from digimon_rules import SIZES, STAGES
+from digimon_assets import ThemeImageCache
+from digimon_bundle import BUNDLE_SUFFIX, bundle_key, close_bundle, open_bundle, open_bundles, split_member_path
+from digimon_bundle_view import BundleWindow
+from digimon_hud import DebugHud
+from digimon_lifecycle import SheetLifecycle
+from digimon_scheduler import RecalcScheduler
+from digimon_session import SheetRegistry, path_key
+from digimon_trace import traced, tracer
 
 class DigimonDNDApp:
     def __init__(self, root):
@@ -24,11 +27,33 @@ class DigimonDNDApp:
         
         # Initialize variables
         self.current_theme = "Agumon"
-        self.open_sheets = []
+        self.open_sheets = SheetRegistry()
         self.notebook = None
         self.current_file = None
         self.tab_counter = 0
         
+        # Coalescing window for stat recalculation (0 = next idle cycle)
+        self.recalc_delay_ms = 0
+        
+        # Most sheet forms kept built at once; the least recently used ones
+        # beyond this are unloaded back to plain data
+        self.max_materialized_sheets = 8
+        self.sheet_use_counter = 0
+        
+        # Worker threads for sheet file I/O, and how opened files are
+        # turned into tabs (tabs per batch, delay between batches)
+        self.io_executor = ThreadPoolExecutor(max_workers=4)
+        self.open_batch_size = 10
+        self.open_batch_delay_ms = 15
+        
+        # Open campaign bundle windows; a bundle stays open while one of
+        # these or a tab of one of its members uses it
+        self.bundle_windows = []
+        
+        # Edited sheets that already have a file are saved in the
+        # background this often
+        self.autosave_interval_ms = 30000
+        
         # Theme colors
         self.themes = {
             "Agumon": {
@@ -37,7 +62,8 @@ class DigimonDNDApp:
                 "accent": "#f1ba63",
                 "text": "white",
                 "highlight": "#f1ba63",
-                "secondary_bg": "#444444"
+                "secondary_bg": "#444444",
+                "image": "agumon.png"
             },
             "Gabumon": {
                 "bg": "#443c70",  # Navy blue
@@ -45,7 +71,8 @@ class DigimonDNDApp:
                 "accent": "#443c70",
                 "text": "white",
                 "highlight": "#5b5294",
-                "secondary_bg": "#383361"
+                "secondary_bg": "#383361",
+                "image": "gabumon.png"
             },
             "Guilmon": {
                 "bg": "#4d1f1f",  # Dark red
@@ -53,7 +80,8 @@ class DigimonDNDApp:
                 "accent": "#4d1f1f",
                 "text": "white",
                 "highlight": "#5b3a3a",
-                "secondary_bg": "#3b2a2a"
+                "secondary_bg": "#3b2a2a",
+                "image": "guilmon.png"
             },
             "Terriermon": {
                 "bg": "#3d5b1f",  # Forest green
@@ -61,7 +89,8 @@ class DigimonDNDApp:
                 "accent": "#3d5b1f",
                 "text": "white",
                 "highlight": "#5b5b3a",
-                "secondary_bg": "#3b3b2a"
+                "secondary_bg": "#3b3b2a",
+                "image": "terriermon.png"
             },
             "Tsukaimon": {
                 "bg": "#5e219c",  # Dark Purple
@@ -69,7 +98,8 @@ class DigimonDNDApp:
                 "accent": "#5e219c",
                 "text": "black",
                 "highlight": "#5b5b3a",
-                "secondary_bg": "#cccccc"
+                "secondary_bg": "#cccccc",
+                "image": "tsukaimon.png"
             },
             "Sunarizamon": {
                 "bg": "#d3db3d",  # Olive green
@@ -77,10 +107,20 @@ class DigimonDNDApp:
                 "accent": "#3d5b1f",
                 "text": "black",
                 "highlight": "#5b5b3a",
-                "secondary_bg": "#cccccc"
+                "secondary_bg": "#cccccc",
+                "image": "sunarizamon.png"
             }
         }
         
+        # Theme artwork is decoded once and shared; start reading it from disk now
+        self.theme_images = ThemeImageCache(
+            self.root, {name: theme["image"] for name, theme in self.themes.items()}
+        )
+        self.theme_images.preload()
+        
+        # Live performance counters, hidden until toggled from the Help menu
+        self.debug_hud = DebugHud(self)
+        
         # Create UI
         self.setup_ui()
         
@@ -95,6 +135,19 @@ class DigimonDNDApp:
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill="both", expand=True, padx=10, pady=10)
         
+        # Sheet forms are only built when their tab is first shown
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        
+        # Edits in any sheet form mark that sheet for autosave
+        self.root.bind_class("SheetEdit", "<KeyRelease>", self.on_sheet_edited)
+        self.root.bind_class("SheetEdit", "<<ComboboxSelected>>", self.on_sheet_edited)
+        self.root.bind_class("SheetEdit", "<<Paste>>", self.on_sheet_edited)
+        self.root.bind_class("SheetEdit", "<<Cut>>", self.on_sheet_edited)
+        self.root.bind_class("SheetEdit", "<ButtonRelease-2>", self.on_sheet_edited)
+        self.root.after(self.autosave_interval_ms, self.autosave)
+        
+        self.root.bind("<F12>", lambda event: self.debug_hud.toggle())
+        
         # Welcome tab
         welcome_frame = ttk.Frame(self.notebook)
         self.notebook.add(welcome_frame, text="Welcome")
@@ -107,47 +160,18 @@ class DigimonDNDApp:
         )
         welcome_label.pack(pady=50)
         
-        info_text = (
-            "Create a new character sheet from the File menu or open an existing one.\n\n"
-            "Current Theme: " + self.current_theme
-        )
-        info_label = ttk.Label(welcome_frame, text=info_text, font=("Arial", 12))
-        info_label.pack(pady=20)
+        self.welcome_info_label = ttk.Label(welcome_frame, font=("Arial", 12))
+        self.welcome_info_label.pack(pady=20)
         
         # Add theme image
         img_frame = ttk.Frame(welcome_frame)
         img_frame.pack(pady=30)
         
-        if self.current_theme == "Agumon":
-            agumon_img = tk.PhotoImage(file=resource_path("agumon.png"))
-            agumon_label = ttk.Label(img_frame, image=agumon_img)
-            agumon_label.image = agumon_img
-            agumon_label.grid(row=0, column=0, padx=10)
-        elif self.current_theme == "Gabumon":
-            gabumon_img = tk.PhotoImage(file=resource_path("gabumon.png"))
-            gabumon_label = ttk.Label(img_frame, image=gabumon_img)
-            gabumon_label.image = gabumon_img
-            gabumon_label.grid(row=0, column=0, padx=10)
-        elif self.current_theme == "Guilmon":
-            guilmon_img = tk.PhotoImage(file=resource_path("guilmon.png"))
-            guilmon_label = ttk.Label(img_frame, image=guilmon_img)
-            guilmon_label.image = guilmon_img
-            guilmon_label.grid(row=0, column=0, padx=10)
-        elif self.current_theme == "Terriermon":
-            terriermon_img = tk.PhotoImage(file=resource_path("terriermon.png"))
-            terriermon_label = ttk.Label(img_frame, image=terriermon_img)
-            terriermon_label.image = terriermon_img
-            terriermon_label.grid(row=0, column=0, padx=10)
-        elif self.current_theme == "Tsukaimon":
-            tsukaimon_img = tk.PhotoImage(file=resource_path("tsukaimon.png"))
-            tsukaimon_label = ttk.Label(img_frame, image=tsukaimon_img)
-            tsukaimon_label.image = tsukaimon_img
-            tsukaimon_label.grid(row=0, column=0, padx=10)
-        elif self.current_theme == "Sunarizamon":
-            sunarizamon_img = tk.PhotoImage(file=resource_path("sunarizamon.png"))
-            sunarizamon_label = ttk.Label(img_frame, image=sunarizamon_img)
-            sunarizamon_label.image = sunarizamon_img
-            sunarizamon_label.grid(row=0, column=0, padx=10)
+        self.welcome_image_label = ttk.Label(img_frame)
+        self.welcome_image_label.grid(row=0, column=0, padx=10)
+        
+        # Fill in the theme dependent text and image
+        self.update_welcome_tab()
         
         # Buttons
         button_frame = ttk.Frame(welcome_frame)
@@ -210,10 +234,18 @@ class DigimonDNDApp:
         file_menu = tk.Menu(menubar, tearoff=0)
         file_menu.add_command(label="New Character Sheet", command=self.new_sheet)
         file_menu.add_command(label="Open Character Sheet", command=self.open_sheet)
+        file_menu.add_command(label="Open Many Character Sheets", command=self.open_many_sheets)
+        file_menu.add_command(label="Open Folder", command=self.open_sheet_folder)
+        file_menu.add_command(label="New Campaign Bundle...", command=self.new_campaign_bundle)
+        file_menu.add_command(label="Open Campaign Bundle...", command=self.open_campaign_bundle)
         file_menu.add_command(label="Save", command=self.save_sheet)
         file_menu.add_command(label="Save As", command=self.save_as)
+        file_menu.add_command(label="Save All", command=self.save_all_sheets)
         file_menu.add_command(label="Close Character Sheet", command=self.close_sheet)
         file_menu.add_separator()
+        file_menu.add_command(label="Load House Rules...", command=self.load_house_rules)
+        file_menu.add_command(label="Use Standard Rules", command=lambda: self.apply_rules(None))
+        file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         menubar.add_cascade(label="File", menu=file_menu)
         
@@ -230,165 +262,47 @@ class DigimonDNDApp:
         # Help menu
         help_menu = tk.Menu(menubar, tearoff=0)
         help_menu.add_command(label="About", command=self.show_about)
+        help_menu.add_command(label="Debug Panel", accelerator="F12", command=self.debug_hud.toggle)
+        help_menu.add_command(label="Export Diagnostics...", command=self.export_metrics)
+        self.trace_var = tk.BooleanVar(value=tracer.enabled)
+        help_menu.add_checkbutton(label="Record Trace", variable=self.trace_var, command=self.toggle_trace)
         menubar.add_cascade(label="Help", menu=help_menu)
         
         self.root.config(menu=menubar)
     
+    @traced("change_theme")
     def change_theme(self, theme_name):
         self.current_theme = theme_name
+        
+        # ttk widgets pick the new colors up from the style
         self.configure_style()
+        
+        # Only the welcome tab and the raw Tk widgets need updating by hand,
+        # so open sheets (and their unsaved edits) are left in place
+        self.update_welcome_tab()
+        theme = self.themes[self.current_theme]
+        for sheet in self.open_sheets:
+            form_refs = sheet.get("view") or {}
+            if "canvas" in form_refs:
+                form_refs["canvas"].configure(bg=theme["bg"])
+            if "qualities_text" in form_refs:
+                form_refs["qualities_text"].configure(bg=theme["secondary_bg"], fg=theme["text"])
+        
         messagebox.showinfo("Theme Changed", f"Theme changed to {theme_name}")
+    
+    def update_welcome_tab(self):
+        info_text = (
+            "Create a new character sheet from the File menu or open an existing one.\n\n"
+            "Current Theme: " + self.current_theme
+        )
+        self.welcome_info_label.configure(text=info_text)
         
-        # Rebuild current tabs with new theme
-        active_tab = self.notebook.select()
-        if active_tab:
-            index = self.notebook.index(active_tab)
-            
-            # Check if the active tab is the welcome tab
-            if index == 0:
-                # Recreate the welcome tab
-                self.notebook.forget(active_tab)
-                welcome_frame = ttk.Frame(self.notebook)
-                
-                # Recreate the welcome content
-                self.notebook.add(welcome_frame, text="Welcome")
-                welcome_label = ttk.Label(
-                    welcome_frame, 
-                    text="Welcome to Digimon Digital Adventures Digimon Sheet", 
-                    font=("Arial", 18, "bold")
-                )
-                welcome_label.pack(pady=50)
-                info_text = (
-                    "Create a new character sheet from the File menu or open an existing one.\n\n"
-                    "Current Theme: " + self.current_theme
-                )
-                info_label = ttk.Label(welcome_frame, text=info_text, font=("Arial", 12))
-                info_label.pack(pady=20)
-                
-                # Recreate the image
-                img_frame = ttk.Frame(welcome_frame)
-                img_frame.pack(pady=30)
-                
-                if self.current_theme == "Agumon":
-                    agumon_img = tk.PhotoImage(file=resource_path("agumon.png"))
-                    agumon_label = ttk.Label(img_frame, image=agumon_img)
-                    agumon_label.image = agumon_img
-                    agumon_label.grid(row=0, column=0, padx=10)
-                elif self.current_theme == "Gabumon":
-                    gabumon_img = tk.PhotoImage(file=resource_path("gabumon.png"))
-                    gabumon_label = ttk.Label(img_frame, image=gabumon_img)
-                    gabumon_label.image = gabumon_img
-                    gabumon_label.grid(row=0, column=0, padx=10)
-                elif self.current_theme == "Guilmon":
-                    guilmon_img = tk.PhotoImage(file=resource_path("guilmon.png"))
-                    guilmon_label = ttk.Label(img_frame, image=guilmon_img)
-                    guilmon_label.image = guilmon_img
-                    guilmon_label.grid(row=0, column=0, padx=10)
-                elif self.current_theme == "Terriermon":
-                    terriermon_img = tk.PhotoImage(file=resource_path("terriermon.png"))
-                    terriermon_label = ttk.Label(img_frame, image=terriermon_img)
-                    terriermon_label.image = terriermon_img
-                    terriermon_label.grid(row=0, column=0, padx=10)
-                elif self.current_theme == "Tsukaimon":
-                    tsukaimon_img = tk.PhotoImage(file=resource_path("tsukaimon.png"))
-                    tsukaimon_label = ttk.Label(img_frame, image=tsukaimon_img)
-                    tsukaimon_label.image = tsukaimon_img
-                    tsukaimon_label.grid(row=0, column=0, padx=10)
-                elif self.current_theme == "Sunarizamon":
-                    sunarizamon_img = tk.PhotoImage(file=resource_path("sunarizamon.png"))
-                    sunarizamon_label = ttk.Label(img_frame, image=sunarizamon_img)
-                    sunarizamon_label.image = sunarizamon_img
-                    sunarizamon_label.grid(row=0, column=0, padx=10)
-                
-                # Recreate buttons
-                button_frame = ttk.Frame(welcome_frame)
-                button_frame.pack(pady=30)
-                new_button = ttk.Button(button_frame, text="New Character Sheet", command=self.new_sheet)
-                new_button.grid(row=0, column=0, padx=10)
-                open_button = ttk.Button(button_frame, text="Open Character Sheet", command=self.open_sheet)
-                open_button.grid(row=0, column=1, padx=10)
-            
-            # If the active tab is not the welcome tab, recreate it
-            else:
-                # Find the Welcome tab
-                welcome_tab = self.notebook.nametowidget(self.notebook.tabs()[0])
-
-                # Recreate the welcome tab
-                self.notebook.forget(welcome_tab)
-                welcome_frame = ttk.Frame(self.notebook)
-                
-                # Recreate the welcome content
-                self.notebook.add(welcome_frame, text="Welcome")
-                welcome_label = ttk.Label(
-                    welcome_frame, 
-                    text="Welcome to Digimon Digital Adventures Digimon Sheet", 
-                    font=("Arial", 18, "bold")
-                )
-                welcome_label.pack(pady=50)
-                info_text = (
-                    "Create a new character sheet from the File menu or open an existing one.\n\n"
-                    "Current Theme: " + self.current_theme
-                )
-                info_label = ttk.Label(welcome_frame, text=info_text, font=("Arial", 12))
-                info_label.pack(pady=20)
-                
-                # Recreate the image
-                img_frame = ttk.Frame(welcome_frame)
-                img_frame.pack(pady=30)
-                if self.current_theme == "Agumon":
-                    agumon_img = tk.PhotoImage(file="agumon.png")
-                    agumon_label = ttk.Label(img_frame, image=agumon_img)
-                    agumon_label.image = agumon_img
-                    agumon_label.grid(row=0, column=0, padx=10)
-                elif self.current_theme == "Gabumon":
-                    gabumon_img = tk.PhotoImage(file="gabumon.png")
-                    gabumon_label = ttk.Label(img_frame, image=gabumon_img)
-                    gabumon_label.image = gabumon_img
-                    gabumon_label.grid(row=0, column=0, padx=10)
-                elif self.current_theme == "Guilmon":
-                    guilmon_img = tk.PhotoImage(file="guilmon.png")
-                    guilmon_label = ttk.Label(img_frame, image=guilmon_img)
-                    guilmon_label.image = guilmon_img
-                    guilmon_label.grid(row=0, column=0, padx=10)
-                elif self.current_theme == "Terriermon":
-                    terriermon_img = tk.PhotoImage(file="terriermon.png")
-                    terriermon_label = ttk.Label(img_frame, image=terriermon_img)
-                    terriermon_label.image = terriermon_img
-                    terriermon_label.grid(row=0, column=0, padx=10) 
-                elif self.current_theme == "Tsukaimon":
-                    tsukaimon_img = tk.PhotoImage(file="tsukaimon.png")
-                    tsukaimon_label = ttk.Label(img_frame, image=tsukaimon_img)
-                    tsukaimon_label.image = tsukaimon_img
-                    tsukaimon_label.grid(row=0, column=0, padx=10)
-                
-                # Recreate buttons
-                button_frame = ttk.Frame(welcome_frame)
-                button_frame.pack(pady=30)
-                new_button = ttk.Button(button_frame, text="New Character Sheet", command=self.new_sheet)
-                new_button.grid(row=0, column=0, padx=10)
-                open_button = ttk.Button(button_frame, text="Open Character Sheet", command=self.open_sheet)
-
-            # Recreate all character sheets with new theme
-            for sheet in self.open_sheets:
-                sheet["frame"].destroy()
-                new_frame = ttk.Frame(self.notebook)
-                self.notebook.add(new_frame, text=sheet["name"])
-                sheet["frame"] = new_frame
-                self.create_character_form(new_frame, sheet["data"])
-            
-            # Select the same tab that was active
-            if index < len(self.open_sheets):
-                self.notebook.select(index)
+        self.welcome_image_label.configure(image=self.theme_images.get(self.current_theme))
     
     def new_sheet(self):
         self.tab_counter += 1
         tab_name = f"New Sheet {self.tab_counter}"
         
-        # Create new frame
-        sheet_frame = ttk.Frame(self.notebook)
-        self.notebook.add(sheet_frame, text=tab_name)
-        self.notebook.select(sheet_frame)
-        
         # Create empty character data
         character_data = {
             "name": "",
@@ -444,50 +358,287 @@ class DigimonDNDApp:
             "dp_allocated_var": 10,
         }
         
-        # Store sheet data
-        sheet_info = {
-            "name": tab_name,
-            "frame": sheet_frame,
-            "data": character_data,
-            "file_path": None
-        }
-        self.open_sheets.append(sheet_info)
-        
-        # Create form
-        self.create_character_form(sheet_frame, character_data)
+        # Create new tab and its form
+        self.add_sheet_tab(character_data, tab_name=tab_name)
     
     def open_sheet(self):
         file_path = filedialog.askopenfilename(
             defaultextension=".json",
-            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")]
+            filetypes=digimon_io.SHEET_FILETYPES
         )
         
         if file_path:
+            # A file that is already open just gets its tab focused
+            open_sheet = self.open_sheets.by_path(file_path)
+            if open_sheet:
+                self.notebook.select(open_sheet["frame"])
+                return
+            
             try:
-                with open(file_path, 'r') as file:
-                    character_data = json.load(file)
+                character_data = digimon_io.load_sheet_file(file_path)
+                metrics.incr("loads")
                 
                 # Create new tab for opened file
-                file_name = os.path.basename(file_path)
-                sheet_frame = ttk.Frame(self.notebook)
-                self.notebook.add(sheet_frame, text=file_name)
-                self.notebook.select(sheet_frame)
-                
-                # Store sheet data
-                sheet_info = {
-                    "name": file_name,
-                    "frame": sheet_frame,
-                    "data": character_data,
-                    "file_path": file_path
-                }
-                self.open_sheets.append(sheet_info)
-                
-                # Create form
-                self.create_character_form(sheet_frame, character_data)
+                self.add_sheet_tab(character_data, file_path)
                 
             except Exception as e:
+                metrics.error("load", os.path.basename(file_path), e)
                 messagebox.showerror("Error", f"Could not open file: {str(e)}")
     
+    def open_many_sheets(self):
+        file_paths = filedialog.askopenfilenames(
+            defaultextension=".json",
+            filetypes=digimon_io.SHEET_FILETYPES
+        )
+        
+        if file_paths:
+            self.open_sheet_files(list(file_paths))
+    
+    def open_sheet_folder(self):
+        folder = filedialog.askdirectory()
+        if not folder:
+            return
+        
+        try:
+            file_paths = digimon_io.list_sheet_files(folder)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not read folder: {str(e)}")
+            return
+        
+        if not file_paths:
+            messagebox.showinfo("Info", "No character sheets found in that folder")
+            return
+        
+        self.open_sheet_files(file_paths)
+    
+    def new_campaign_bundle(self):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=BUNDLE_SUFFIX,
+            filetypes=[("Campaign Bundles", "*" + BUNDLE_SUFFIX), ("All Files", "*.*")]
+        )
+        # The file is created on first use; an existing bundle is opened, not replaced
+        if file_path:
+            self.show_campaign_bundle(file_path)
+    
+    def open_campaign_bundle(self):
+        file_path = filedialog.askopenfilename(
+            defaultextension=BUNDLE_SUFFIX,
+            filetypes=[("Campaign Bundles", "*" + BUNDLE_SUFFIX), ("All Files", "*.*")]
+        )
+        if file_path:
+            self.show_campaign_bundle(file_path)
+    
+    def show_campaign_bundle(self, file_path):
+        # Only the bundle's index is read here; members are read when opened
+        try:
+            bundle = open_bundle(file_path)
+        except Exception as e:
+            metrics.error("load", os.path.basename(file_path), e)
+            messagebox.showerror("Error", f"Could not open campaign bundle: {str(e)}")
+            return
+        self.bundle_windows.append(BundleWindow(self, bundle))
+    
+    def release_unused_bundles(self):
+        # Closes bundles no window or tab uses any more, so their files
+        # aren't kept open (and locked, on Windows) for the whole session
+        in_use = {bundle_key(window.bundle.file_path) for window in self.bundle_windows}
+        for sheet in self.open_sheets:
+            member = sheet["file_path"] and split_member_path(sheet["file_path"])
+            if member:
+                in_use.add(bundle_key(member[0]))
+        for bundle in open_bundles():
+            if bundle_key(bundle.file_path) not in in_use:
+                close_bundle(bundle.file_path)
+    
+    def open_sheet_files(self, file_paths):
+        # Files are read and parsed on the I/O thread pool while tabs are
+        # added a few at a time from the Tk loop, so the window stays responsive
+        
+        # Skip files that are already open (or listed twice)
+        seen = set()
+        new_paths = []
+        for path in file_paths:
+            key = path_key(path)
+            if key not in seen and not self.open_sheets.by_path(path):
+                seen.add(key)
+                new_paths.append(path)
+        if not new_paths:
+            open_sheet = self.open_sheets.by_path(file_paths[0])
+            if open_sheet:
+                self.notebook.select(open_sheet["frame"])
+            return
+        file_paths = new_paths
+        
+        futures = [self.io_executor.submit(digimon_io.load_sheet_file, path) for path in file_paths]
+        
+        # Progress indicator
+        progress_window = tk.Toplevel(self.root)
+        progress_window.title("Opening Character Sheets")
+        progress_window.transient(self.root)
+        progress_label = ttk.Label(progress_window, text=f"Opening 0 of {len(file_paths)}...")
+        progress_label.pack(padx=20, pady=(20, 5))
+        progress_bar = ttk.Progressbar(progress_window, length=300, maximum=len(file_paths))
+        progress_bar.pack(padx=20, pady=(5, 20))
+        # Closing the progress window only hides the progress; the remaining
+        # tabs are still added and errors still reported
+        progress_window.protocol("WM_DELETE_WINDOW", progress_window.destroy)
+        
+        state = {"index": 0, "errors": [], "first_sheet": None}
+        
+        def add_batch():
+            added = 0
+            while (state["index"] < len(futures) and added < self.open_batch_size
+                   and futures[state["index"]].done()):
+                file_path = file_paths[state["index"]]
+                state["index"] += 1
+                try:
+                    character_data = futures[state["index"] - 1].result()
+                    metrics.incr("loads")
+                    sheet_info = self.add_sheet_tab(character_data, file_path, select=False)
+                    if state["first_sheet"] is None:
+                        state["first_sheet"] = sheet_info
+                    added += 1
+                except Exception as e:
+                    metrics.error("load", os.path.basename(file_path), e)
+                    state["errors"].append(f"{os.path.basename(file_path)}: {str(e)}")
+            
+            if progress_window.winfo_exists():
+                progress_bar["value"] = state["index"]
+                progress_label.configure(text=f"Opening {state['index']} of {len(file_paths)}...")
+            
+            if state["index"] < len(futures):
+                self.root.after(self.open_batch_delay_ms, add_batch)
+                return
+            
+            if progress_window.winfo_exists():
+                progress_window.destroy()
+            if state["first_sheet"]:
+                self.notebook.select(state["first_sheet"]["frame"])
+            if state["errors"]:
+                shown = state["errors"][:10]
+                if len(state["errors"]) > len(shown):
+                    shown.append(f"...and {len(state['errors']) - len(shown)} more")
+                messagebox.showerror(
+                    "Error",
+                    f"Could not open {len(state['errors'])} of {len(file_paths)} files:\n\n" + "\n".join(shown)
+                )
+        
+        self.root.after(self.open_batch_delay_ms, add_batch)
+    
+    def load_house_rules(self):
+        file_path = filedialog.askopenfilename(
+            defaultextension=".json",
+            filetypes=[("Rules Files", "*.json"), ("All Files", "*.*")]
+        )
+        if file_path:
+            self.apply_rules(file_path)
+    
+    def apply_rules(self, rules):
+        # Switches every sheet to a rule set (a rules file path, or None for the standard rules)
+        try:
+            rules = digimon_stats.use_rules(rules)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not load rules: {str(e)}")
+            return
+        
+        # Built forms recalculate everything under the new formulas;
+        # unbuilt sheets pick them up when they are next built or saved
+        for sheet in self.open_sheets:
+            view = sheet.get("view")
+            if view:
+                view["stat_graph"].set_rules(rules)
+                view["recalc_scheduler"].mark_dirty("stage")
+        
+        messagebox.showinfo("Rules", f"Now using {rules.name}")
+    
+    def add_sheet_tab(self, character_data, file_path=None, tab_name=None, select=True):
+        # Adds a tab for a sheet as an empty placeholder; the form is only
+        # built once the tab is selected
+        tab_name = tab_name or os.path.basename(file_path)
+        sheet_frame = ttk.Frame(self.notebook)
+        self.notebook.add(sheet_frame, text=tab_name)
+        
+        # Store sheet data: the plain model, plus the form's widgets once built
+        sheet_info = {
+            "name": tab_name,
+            "frame": sheet_frame,
+            "data": Character.from_dict(character_data),
+            "view": None,
+            "file_path": file_path,
+            "materialized": False
+        }
+        self.open_sheets.add(sheet_info)
+        
+        # Selecting the tab builds the form
+        if select:
+            self.notebook.select(sheet_frame)
+            self.materialize_sheet(sheet_info)
+        
+        return sheet_info
+    
+    def on_tab_changed(self, event):
+        current_tab = self.notebook.select()
+        if not current_tab:
+            return
+        
+        sheet_info = self.open_sheets.by_tab(current_tab)
+        if sheet_info:
+            self.materialize_sheet(sheet_info)
+    
+    def materialize_sheet(self, sheet_info):
+        # Build the form of a sheet that so far only exists as plain data
+        self.sheet_use_counter += 1
+        sheet_info["last_used"] = self.sheet_use_counter
+        if sheet_info.get("materialized", True):
+            return
+        sheet_info["materialized"] = True
+        sheet_info["view"] = self.create_character_form(sheet_info["frame"], sheet_info["data"])
+        self.enforce_sheet_limit(sheet_info)
+    
+    def enforce_sheet_limit(self, keep_sheet=None):
+        # Unload the least recently used forms above max_materialized_sheets
+        materialized = [sheet for sheet in self.open_sheets
+                        if sheet.get("materialized", True) and sheet is not keep_sheet]
+        excess = len(materialized) + (1 if keep_sheet else 0) - self.max_materialized_sheets
+        if excess <= 0:
+            return
+        
+        # A sheet that can't be snapshotted stays built; the next least
+        # recently used one is unloaded in its place
+        materialized.sort(key=lambda sheet: sheet.get("last_used", 0))
+        for sheet in materialized:
+            if excess <= 0:
+                break
+            if self.hibernate_sheet(sheet):
+                excess -= 1
+    
+    def hibernate_sheet(self, sheet_info):
+        # Snapshot the form into plain data, then destroy its widgets.
+        # The tab itself stays; selecting it again rebuilds the form.
+        # Returns False if the form couldn't be snapshotted (e.g. a box
+        # being edited holds no number yet); the sheet then stays built.
+        if not sheet_info.get("materialized", True):
+            return False
+        
+        try:
+            self.update_character_data(sheet_info)
+        except Exception as e:
+            metrics.error("hibernate", sheet_info["name"], e)
+            return False
+        self.release_sheet_view(sheet_info)
+        sheet_info["materialized"] = False
+        
+        for child in sheet_info["frame"].winfo_children():
+            child.destroy()
+        return True
+    
+    def release_sheet_view(self, sheet_info):
+        # Drops the traces, global bindings and pending jobs of a sheet's form
+        view = sheet_info.get("view")
+        if view and view.get("lifecycle"):
+            view["lifecycle"].close()
+        sheet_info["view"] = None
+    
     def save_sheet(self):
         current_tab = self.notebook.select()
         if not current_tab:
@@ -495,11 +646,7 @@ class DigimonDNDApp:
             return
         
         # Find the sheet info based on the current tab
-        sheet_info = None
-        for sheet in self.open_sheets:
-            if sheet["frame"] == self.notebook.nametowidget(current_tab):
-                sheet_info = sheet
-                break
+        sheet_info = self.open_sheets.by_tab(current_tab)
         
         if not sheet_info:
             messagebox.showinfo("Info", "No character sheet is open")
@@ -519,11 +666,7 @@ class DigimonDNDApp:
             return
         
         # Find the sheet info based on the current tab
-        sheet_info = None
-        for sheet in self.open_sheets:
-            if sheet["frame"] == self.notebook.nametowidget(current_tab):
-                sheet_info = sheet
-                break
+        sheet_info = self.open_sheets.by_tab(current_tab)
         
         if not sheet_info:
             messagebox.showinfo("Info", "No character sheet is open")
@@ -532,127 +675,326 @@ class DigimonDNDApp:
         # Prompt for file path
         file_path = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")]
+            filetypes=digimon_io.SHEET_FILETYPES
         )
 
         if file_path:
+            # One tab per file
+            other_sheet = self.open_sheets.by_path(file_path)
+            if other_sheet and other_sheet is not sheet_info:
+                messagebox.showerror("Error", f"{os.path.basename(file_path)} is already open in another tab")
+                return
+            
             # Save to file
             self.save_data_to_file(file_path, sheet_info)
             
             # Update the file path in the sheet info
-            sheet_info["file_path"] = file_path
+            self.open_sheets.set_file_path(sheet_info, file_path)
             
             # Update the tab name to the file name
             file_name = os.path.basename(file_path)
             self.notebook.tab(sheet_info["frame"], text=file_name)
             sheet_info["name"] = file_name
+            
+            # The sheet may have been saved out of a bundle
+            self.release_unused_bundles()
 
     def save_data_to_file(self, file_path, sheet_info):
         try:
+            # Apply any recalculation still waiting for the idle loop
+            self.flush_recalculation(sheet_info)
+
             # Get a clean copy of the character data
             clean_data = self.get_updated_character_data(sheet_info)
 
-            # Save the clean copy to the file
-            with open(file_path, 'w') as file:
-                json.dump(clean_data, file, indent=4)
+            # Let a background save of this sheet finish first so it can't overwrite this one
+            if sheet_info.get("save_future"):
+                wait([sheet_info["save_future"]])
+
+            # Save the clean copy to the file (atomically)
+            sheet_info["saved_digest"] = digimon_io.write_sheet_file(file_path, clean_data)
+            sheet_info["dirty"] = False
+            metrics.incr("saves")
+            metrics.touch("save")
             
             messagebox.showinfo("Success", "Character sheet saved successfully!")    
         except Exception as e:
+            metrics.error("save", os.path.basename(file_path), e)
             messagebox.showerror("Error", f"Could not save file: {str(e)}")
     
+    def save_all_sheets(self):
+        # Snapshots every edited sheet on the UI thread, writes them all
+        # concurrently on the I/O pool and reports once when they are done
+        futures = []
+        errors = []
+        untitled = []
+        for sheet in self.open_sheets:
+            if not sheet.get("dirty"):
+                continue
+            if not sheet["file_path"]:
+                untitled.append(sheet["name"])
+                continue
+            
+            try:
+                self.flush_recalculation(sheet)
+                clean_data = self.get_updated_character_data(sheet)
+            except Exception as e:
+                metrics.error("save", sheet["name"], e)
+                errors.append(f"{sheet['name']}: {str(e)}")
+                continue
+            
+            sheet["dirty"] = False
+            sheet["save_future"] = self.io_executor.submit(
+                digimon_io.write_sheet_file_after, sheet.get("save_future"), sheet["file_path"], clean_data
+            )
+            sheet["save_future"].add_done_callback(
+                lambda future, sheet=sheet: self.on_background_save_done(sheet, future)
+            )
+            futures.append((sheet, sheet["save_future"]))
+        
+        if not futures and not errors and not untitled:
+            messagebox.showinfo("Info", "No unsaved changes")
+            return
+        
+        def report():
+            if not all(future.done() for _, future in futures):
+                self.root.after(20, report)
+                return
+            
+            saved = 0
+            for sheet, future in futures:
+                if future.exception():
+                    errors.append(f"{sheet['name']}: {str(future.exception())}")
+                else:
+                    saved += 1
+            
+            message = f"Saved {saved} character sheet{'s' if saved != 1 else ''}."
+            if untitled:
+                message += "\n\nNot saved yet, use Save As:\n" + "\n".join(untitled)
+            if errors:
+                message += "\n\nCould not save:\n" + "\n".join(errors)
+                messagebox.showerror("Save All", message)
+            else:
+                messagebox.showinfo("Save All", message)
+        
+        report()
+    
+    def autosave(self):
+        # Snapshots dirty sheets on the UI thread and hands the writing to
+        # the I/O pool; unchanged content is detected by digest and skipped
+        try:
+            for sheet in self.open_sheets:
+                if not sheet.get("dirty") or not sheet["file_path"]:
+                    continue
+                if sheet.get("save_future") and not sheet["save_future"].done():
+                    continue
+                
+                try:
+                    self.flush_recalculation(sheet)
+                    clean_data = self.get_updated_character_data(sheet)
+                except Exception as e:
+                    metrics.error("autosave", sheet["name"], e)
+                    continue
+                
+                sheet["dirty"] = False
+                sheet["save_future"] = self.io_executor.submit(
+                    digimon_io.write_sheet_file, sheet["file_path"], clean_data, sheet.get("saved_digest")
+                )
+                sheet["save_future"].add_done_callback(
+                    lambda future, sheet=sheet: self.on_background_save_done(sheet, future)
+                )
+        finally:
+            self.root.after(self.autosave_interval_ms, self.autosave)
+    
+    def on_background_save_done(self, sheet_info, future):
+        # Runs on the worker thread, so only plain data is touched here
+        try:
+            sheet_info["saved_digest"] = future.result()
+            sheet_info["save_error"] = None
+            metrics.incr("saves")
+            metrics.touch("save")
+        except Exception as e:
+            sheet_info["dirty"] = True
+            sheet_info["save_error"] = str(e)
+            metrics.error("save", sheet_info["name"], e)
+    
+    def on_sheet_edited(self, event):
+        self.mark_widget_sheet_dirty(event.widget)
+        
+        # Attack and effect rows are re-read on the next save only when edited
+        widget = event.widget
+        while widget is not None and not hasattr(widget, "row_refs"):
+            widget = widget.master
+        if widget is not None:
+            widget.row_refs["dirty"] = True
+    
+    def mark_widget_sheet_dirty(self, widget):
+        sheet_info = self.sheet_for_widget(widget)
+        if sheet_info:
+            sheet_info["dirty"] = True
+    
+    def sheet_for_widget(self, widget):
+        return self.open_sheets.by_widget(widget)
+    
+    def tag_sheet_widgets(self, widget):
+        # Adds the SheetEdit bind tag to every input widget under widget.
+        # Rows built with the form were already tagged when it was, so
+        # widgets that have the tag are left alone.
+        if widget.winfo_class() in ("TEntry", "TCombobox", "Text"):
+            tags = widget.bindtags()
+            if "SheetEdit" not in tags:
+                widget.bindtags(tags + ("SheetEdit",))
+        for child in widget.winfo_children():
+            self.tag_sheet_widgets(child)
+    
+    def flush_recalculation(self, sheet_info):
+        recalc_scheduler = (sheet_info.get("view") or {}).get("recalc_scheduler")
+        if recalc_scheduler:
+            recalc_scheduler.flush()
+
     def get_updated_character_data(self, sheet_info):
         # Creates a clean copy of the character data based on current form data
         # Returns a new dictionary with the updated data
 
-        # Make a deep copy of the original data
-        updated_data = {}
-        form_refs = sheet_info["data"].get("_form_refs", {})
+        # Sheets whose tab was never shown have no form to read from
+        if not sheet_info.get("materialized", True):
+            return self.get_model_character_data(sheet_info)
 
-        # Basic info
-        updated_data["name"] = form_refs["name_entry"].get() if "name_entry" in form_refs else ""
-        updated_data["digimon"] = form_refs["digimon_entry"].get() if "digimon_entry" in form_refs else ""
-        updated_data["stage"] = form_refs["stage_combo"].get() if "stage_combo" in form_refs else "Child"
-        updated_data["size"] = form_refs["size_combo"].get() if "size_combo" in form_refs else "Medium"
-        updated_data["attribute"] = form_refs["attr_combo"].get() if "attr_combo" in form_refs else "Vaccine"
-        updated_data["type"] = form_refs["type_entry"].get() if "type_entry" in form_refs else ""
+        form_refs = sheet_info["view"]
+
+        # Only fields changed since the last snapshot are read back from the
+        # widgets; everything else comes from the cached snapshot
+        snapshot = form_refs.get("snapshot")
+        dirty_fields = form_refs.get("dirty_fields")
+        if snapshot is None or dirty_fields is None:
+            snapshot = {}
+            fields = SHEET_FIELDS
+        else:
+            fields = [field for field in SHEET_FIELDS if field in dirty_fields]
+        
+        for field in fields:
+            snapshot[field] = self.read_form_field(form_refs, field)
+            if dirty_fields is not None:
+                dirty_fields.discard(field)
+        form_refs["snapshot"] = snapshot
 
+        # Attacks and effects keep their own per-row snapshots
+        snapshot["attacks"] = [self.read_attack_row(row_refs) for row_refs in form_refs["attack_rows"]]
+        snapshot["effects"] = [self.read_effect_row(row_refs) for row_refs in form_refs["effect_rows"]]
+
+        # Cached values are replaced rather than mutated, so a shallow copy
+        # is safe to hand to other threads
+        updated_data = {"schema_version": SCHEMA_VERSION}
+        updated_data.update((field, snapshot[field]) for field in SHEET_FIELDS)
+        
+        # Keep any keys the form doesn't know about
+        updated_data.update(sheet_info["data"].extra)
+        return updated_data
+    
+    def read_form_field(self, form_refs, field):
+        # Reads one top-level field of the character data back from the form
+        
+        # Basic info
+        if field in ("name", "digimon", "stage", "size", "attribute", "type"):
+            widget_name, default = {
+                "name": ("name_entry", ""),
+                "digimon": ("digimon_entry", ""),
+                "stage": ("stage_combo", "Child"),
+                "size": ("size_combo", "Medium"),
+                "attribute": ("attr_combo", "Vaccine"),
+                "type": ("type_entry", "")
+            }[field]
+            return form_refs[widget_name].get() if widget_name in form_refs else default
+        
         # Wound and Temp boxes
-        updated_data["wound_boxes"] = int(form_refs["wound_var"].get()) if "wound_var" in form_refs else 0
-        updated_data["temp_boxes"] = int(form_refs["temp_var"].get()) if "temp_var" in form_refs else 0
-        updated_data["battery"] = int(form_refs["batt_var"].get()) if "batt_var" in form_refs else 0
+        if field in ("wound_boxes", "temp_boxes", "battery"):
+            var_name = {"wound_boxes": "wound_var", "temp_boxes": "temp_var", "battery": "batt_var"}[field]
+            return int(form_refs[var_name].get()) if var_name in form_refs else 0
 
         # Base Stats
-        updated_data["stats"] = {}
-        for stat in ["acc", "dam", "dod", "arm", "hp"]:
-            dp_var = form_refs["dp_vars"].get(f"{stat}_dp")
-            bonus_var = form_refs["bonus_vars"].get(f"{stat}_bonus")
+        if field == "stats":
+            stats = {}
+            for stat in ["acc", "dam", "dod", "arm", "hp"]:
+                dp_var = form_refs["dp_vars"].get(f"{stat}_dp")
+                bonus_var = form_refs["bonus_vars"].get(f"{stat}_bonus")
 
-            updated_data["stats"][f"{stat}_dp"] = int(dp_var.get() or 0) if dp_var else 0
-            updated_data["stats"][f"{stat}_bonus"] = int(bonus_var.get() or 0) if bonus_var else 0
+                stats[f"{stat}_dp"] = int(dp_var.get() or 0) if dp_var else 0
+                stats[f"{stat}_bonus"] = int(bonus_var.get() or 0) if bonus_var else 0
+            return stats
         
         # Derived Stats
-        updated_data["derived_stats"] = {}
-        for stat in ["bit", "dos", "ram", "cpu"]:
-            bonus_var = form_refs["derived_bonus_vars"].get(f"{stat}_bonus")
-            updated_data["derived_stats"][f"{stat}_bonus"] = int(bonus_var.get() or 0) if bonus_var else 0
+        if field == "derived_stats":
+            derived_stats = {}
+            for stat in ["bit", "dos", "ram", "cpu"]:
+                bonus_var = form_refs["derived_bonus_vars"].get(f"{stat}_bonus")
+                derived_stats[f"{stat}_bonus"] = int(bonus_var.get() or 0) if bonus_var else 0
+            return derived_stats
         
         # Misc Stats
-        updated_data["misc_stats"] = {}
-        for stat in ["move", "init", "range", "max_range"]:
-            bonus_var = form_refs["misc_bonus_vars"].get(f"{stat}_bonus")
-            updated_data["misc_stats"][f"{stat}_bonus"] = int(bonus_var.get() or 0) if bonus_var else 0
+        if field == "misc_stats":
+            misc_stats = {}
+            for stat in ["move", "init", "range", "max_range"]:
+                bonus_var = form_refs["misc_bonus_vars"].get(f"{stat}_bonus")
+                misc_stats[f"{stat}_bonus"] = int(bonus_var.get() or 0) if bonus_var else 0
+            return misc_stats
         
         # Qualities
-        updated_data["qualities"] = form_refs["qualities_text"].get("1.0", tk.END).strip() if "qualities_text" in form_refs else ""
+        if field == "qualities":
+            return form_refs["qualities_text"].get("1.0", tk.END).strip() if "qualities_text" in form_refs else ""
 
-        # Attacks (collect from form refs) in each attack data)
-        updated_data["attacks"] = []
-        for attack in sheet_info["data"].get("attacks", []):
-            attack_refs = attack.get("_form_refs", {})
-            if attack_refs:
-                updated_attack = {
-                    "name": attack_refs["name"].get(),
-                    "accuracy": int(attack_refs["accuracy"].get() or 0),
-                    "type": attack_refs["type"].get(),
-                    "damage": int(attack_refs["damage"].get() or 0),
-                    "tags": [tag.get() for tag in attack_refs["tags"]]
-                }
-                updated_data["attacks"].append(updated_attack)
-        
-        # Effects (collect from form refs) in each effect data)
-        updated_data["effects"] = []
-        for effect in sheet_info["data"].get("effects", []):
-            effect_refs = effect.get("_form_refs", {})
-            if effect_refs:
-                updated_effect = {
-                    "eff_name": effect_refs["eff_name"].get(),
-                    "potency": int(effect_refs["potency"].get() or 0),
-                    "duration": int(effect_refs["duration"].get() or 0),
-                }
-                updated_data["effects"].append(updated_effect)
+        # Attacks and effects are read per row
+        if field in ("attacks", "effects"):
+            return []
 
-        # Get all Allocated DP info
-        updated_data["bonus_dp_var"] = int(form_refs["bonus_dp_var"].get()) if "bonus_dp_var" in form_refs else 0
-        updated_data["quality_spent_var"] = int(form_refs["quality_spent_var"].get()) if "quality_spent_var" in form_refs else 0
-        updated_data["stat_spent_var"] = int(form_refs["stat_spent_var"].get()) if "stat_spent_var" in form_refs else 0
-        updated_data["dp_spent_var"] = int(form_refs["dp_spent_var"].get()) if "dp_spent_var" in form_refs else 0
-        updated_data["dp_allocated_var"] = int(form_refs["dp_allocated_var"].get()) if "dp_allocated_var" in form_refs else 0
-        
-        return updated_data
+        # Allocated DP info
+        return int(form_refs[field].get()) if field in form_refs else 0
+    
+    def read_attack_row(self, attack_refs):
+        if attack_refs.get("dirty", True) or "snapshot" not in attack_refs:
+            attack_refs["snapshot"] = {
+                "name": attack_refs["name"].get(),
+                "accuracy": int(attack_refs["accuracy"].get() or 0),
+                "type": attack_refs["type"].get(),
+                "damage": int(attack_refs["damage"].get() or 0),
+                "tags": [tag.get() for tag in attack_refs["tags"]]
+            }
+            attack_refs["dirty"] = False
+        return attack_refs["snapshot"]
     
+    def read_effect_row(self, effect_refs):
+        if effect_refs.get("dirty", True) or "snapshot" not in effect_refs:
+            effect_refs["snapshot"] = {
+                "eff_name": effect_refs["eff_name"].get(),
+                "potency": int(effect_refs["potency"].get() or 0),
+                "duration": int(effect_refs["duration"].get() or 0),
+            }
+            effect_refs["dirty"] = False
+        return effect_refs["snapshot"]
+    
+    def get_model_character_data(self, sheet_info):
+        # Same layout as get_updated_character_data, built from the plain
+        # character data of a sheet that has no form
+        updated_data = sheet_info["data"].to_dict()
+
+        # Fill in the DP totals the form would have calculated
+        try:
+            results = digimon_stats.compute_stats(updated_data)
+        except Exception as e:
+            metrics.error("calculate", sheet_info["name"], e)
+        else:
+            updated_data["stat_spent_var"] = results["stat_spent"]
+            updated_data["dp_spent_var"] = results["dp_spent"]
+            updated_data["dp_allocated_var"] = results["dp_allocated"]
+
+        return updated_data
+
     def update_character_data(self, sheet_info):
-        # Update the character data based on the current form data
+        # Update the character model based on the current form data
+        if not sheet_info.get("materialized", True):
+            return
+        self.flush_recalculation(sheet_info)
         updated_data = self.get_updated_character_data(sheet_info)
-        # Preserve any metadata that might be in the original data
-        for key, value in updated_data.items():
-            if key not in sheet_info["data"]:
-                sheet_info["data"][key] = value
-            else:
-                sheet_info["data"][key].update(value)
-        
-        # Keep the form references in the original data
-        if "_form_refs" in sheet_info["data"]:
-            updated_data["_form_refs"] = sheet_info["data"]["_form_refs"]
+        sheet_info["data"] = Character.from_dict(updated_data)
 
     #Helper function to safely convert string to int
     def safe_int(self, value):
@@ -668,22 +1010,22 @@ class DigimonDNDApp:
         current_tab = self.notebook.select()
         if current_tab and current_tab != self.notebook.tabs()[0]:
             # Find the sheet info based on the current tab
-            sheet_info = None
-            for sheet in self.open_sheets:
-                if sheet["frame"] == self.notebook.nametowidget(current_tab):
-                    sheet_info = sheet
-                    break
+            sheet_info = self.open_sheets.by_tab(current_tab)
             
             if sheet_info:
-                # Remove the tab and its data
-                self.notebook.forget(sheet_info["frame"])
-                self.open_sheets.remove(sheet_info)
-                
-                # Destroy the frame to free up resources
-                sheet_info["frame"].destroy()
-                
+                self.remove_sheet(sheet_info)
                 messagebox.showinfo("Info", "Character sheet closed successfully!")
     
+    def remove_sheet(self, sheet_info):
+        # Remove the tab and its data
+        self.release_sheet_view(sheet_info)
+        self.notebook.forget(sheet_info["frame"])
+        self.open_sheets.remove(sheet_info)
+        
+        # Destroy the frame to free up resources
+        sheet_info["frame"].destroy()
+        self.release_unused_bundles()
+    
     def show_about(self):
         about_text = (
             "Digimon 2e Digimon Sheet\n\n"
@@ -693,8 +1035,55 @@ class DigimonDNDApp:
         )
         messagebox.showinfo("About", about_text)
     
-    def create_character_form(self, parent_frame, character_data):
+    def export_metrics(self):
+        # Writes the usage counters and error tallies of this session to a file
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            initialfile="digimon_diagnostics.json",
+            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        try:
+            metrics.export(file_path)
+            messagebox.showinfo("Success", "Diagnostics exported successfully!")
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not export diagnostics: {str(e)}")
+    
+    def toggle_trace(self):
+        # Starts recording Tk callbacks, or stops and saves the recording
+        if self.trace_var.get():
+            tracer.clear()
+            tracer.start()
+            return
+        
+        tracer.stop()
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            initialfile="digimon_trace.json",
+            filetypes=[("Trace Files", "*.json"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        try:
+            tracer.save(file_path)
+            messagebox.showinfo("Success", f"Trace saved with {len(tracer.events)} events.\n"
+                                "Open it in chrome://tracing or ui.perfetto.dev.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not save trace: {str(e)}")
+    
+    @traced("create_character_form")
+    def create_character_form(self, parent_frame, character):
+        # Builds the form for a Character and returns its view: the dict of
+        # widgets and variables the rest of the app reads the form through
         theme = self.themes[self.current_theme]
+        # Traces, global bindings and after jobs are registered through the
+        # lifecycle so closing the sheet can release them
+        lifecycle = SheetLifecycle(parent_frame)
+        metrics.incr("forms_built")
+        view = {"attack_rows": [], "effect_rows": [], "lifecycle": lifecycle}
         
         # Create main container with scrollbar
         canvas = tk.Canvas(parent_frame, bg=theme["bg"])
@@ -714,9 +1103,12 @@ class DigimonDNDApp:
         scrollbar.pack(side="right", fill="y")
         canvas.pack(side="left", fill="both", expand=True)
         
-        # Add mouse wheel scrolling
+        # Add mouse wheel scrolling (the binding is global, so only scroll
+        # when the wheel is used over this sheet)
+        sheet_path = str(parent_frame) + "."
         def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+            if str(event.widget).startswith(sheet_path):
+                canvas.yview_scroll(int(-1*(event.delta/120)), "units")
         
         # Add Mobile support for scrolling
         def _on_touch_start(event):
@@ -728,7 +1120,7 @@ class DigimonDNDApp:
         #Bind all events to the canvas
         canvas.bind("<Button-1>", _on_touch_start)
         canvas.bind("<B1-Motion>", _on_touch_move)
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        lifecycle.bind_all("<MouseWheel>", _on_mousewheel)
         
         # Start creating the character sheet
         # Top Line
@@ -737,44 +1129,50 @@ class DigimonDNDApp:
         
         # Character basic info (Name, Digimon, Stage, Size, Attribute, Type)
         ttk.Label(top_frame, text="Name:").grid(row=0, column=0, padx=5, pady=5, sticky="e")
-        name_entry = ttk.Entry(top_frame)
+        name_var = tk.StringVar()
+        name_entry = ttk.Entry(top_frame, textvariable=name_var)
         name_entry.grid(row=0, column=1, padx=5, pady=5)
-        name_entry.insert(0, character_data.get("name", ""))
+        name_entry.insert(0, character.name)
         
         ttk.Label(top_frame, text="Digimon:").grid(row=0, column=2, padx=5, pady=5, sticky="e")
-        digimon_entry = ttk.Entry(top_frame)
+        digimon_var = tk.StringVar()
+        digimon_entry = ttk.Entry(top_frame, textvariable=digimon_var)
         digimon_entry.grid(row=0, column=3, padx=5, pady=5)
-        digimon_entry.insert(0, character_data.get("digimon", ""))
+        digimon_entry.insert(0, character.digimon)
         
         ttk.Label(top_frame, text="Stage:").grid(row=0, column=4, padx=5, pady=5, sticky="e")
-        stage_combo = ttk.Combobox(top_frame, values=["Baby", "Child", "Adult", "Perfect", "Ultimate"])
+        stage_var = tk.StringVar()
+        stage_combo = ttk.Combobox(top_frame, values=list(STAGES), textvariable=stage_var)
         stage_combo.grid(row=0, column=5, padx=5, pady=5)
-        stage_combo.set(character_data.get("stage", "Child"))
+        stage_combo.set(character.stage)
         
         ttk.Label(top_frame, text="Size:").grid(row=1, column=0, padx=5, pady=5, sticky="e")
-        size_combo = ttk.Combobox(top_frame, values=["Small", "Medium", "Large", "Huge", "Gigantic", "Colossal"])
+        size_var = tk.StringVar()
+        size_combo = ttk.Combobox(top_frame, values=list(SIZES), textvariable=size_var)
         size_combo.grid(row=1, column=1, padx=5, pady=5)
-        size_combo.set(character_data.get("size", "Medium"))
+        size_combo.set(character.size)
         
         ttk.Label(top_frame, text="Attribute:").grid(row=1, column=2, padx=5, pady=5, sticky="e")
-        attr_combo = ttk.Combobox(top_frame, values=["Vaccine", "Data", "Virus"])
+        attr_var = tk.StringVar()
+        attr_combo = ttk.Combobox(top_frame, values=["Vaccine", "Data", "Virus"], textvariable=attr_var)
         attr_combo.grid(row=1, column=3, padx=5, pady=5)
-        attr_combo.set(character_data.get("attribute", "Vaccine"))
+        attr_combo.set(character.attribute)
         
         ttk.Label(top_frame, text="Type:").grid(row=1, column=4, padx=5, pady=5, sticky="e")
-        type_entry = ttk.Entry(top_frame)
+        type_var = tk.StringVar()
+        type_entry = ttk.Entry(top_frame, textvariable=type_var)
         type_entry.grid(row=1, column=5, padx=5, pady=5)
-        type_entry.insert(0, character_data.get("type", ""))
+        type_entry.insert(0, character.type)
         
         # DP Allocation - Creating Variables before any Calculations
-        bonus_dp_var = tk.StringVar(value=str(character_data.get("bonus_dp_var", 0)))
+        bonus_dp_var = tk.StringVar(value=str(character.bonus_dp_var))
         stat_spent_var = tk.StringVar(value="0")
-        quality_spent_var = tk.StringVar(value=str(character_data.get("quality_spent_var", 0)))
+        quality_spent_var = tk.StringVar(value=str(character.quality_spent_var))
         dp_spent_var = tk.StringVar(value="0")
         dp_allocated_var = tk.StringVar(value="0")
         
         # Store references immediately
-        character_data.setdefault("_form_refs", {}).update({
+        view.update({
             "bonus_dp_var": bonus_dp_var,
             "quality_spent_var": quality_spent_var,
             "stat_spent_var": stat_spent_var,
@@ -791,7 +1189,7 @@ class DigimonDNDApp:
         wound_var = tk.StringVar()
         wound_entry = ttk.Entry(combat_frame, width=5, textvariable=wound_var)
         wound_entry.grid(row=0, column=1, padx=5, pady=5, sticky="w")
-        wound_var.set(str(character_data.get("wound_boxes", 0)))
+        wound_var.set(str(character.wound_boxes))
         
         ttk.Label(combat_frame, text="/").grid(row=0, column=2)
         
@@ -803,14 +1201,14 @@ class DigimonDNDApp:
         temp_var = tk.StringVar()
         temp_entry = ttk.Entry(combat_frame, width=5, textvariable=temp_var)
         temp_entry.grid(row=0, column=5, padx=5, pady=5, sticky="w")
-        temp_var.set(str(character_data.get("temp_boxes", 0)))
+        temp_var.set(str(character.temp_boxes))
 
         ttk.Label(combat_frame, text="Battery").grid(row=0, column=6, padx=20, pady=5, sticky="e")
 
         batt_var = tk.StringVar()
         batt_entry = ttk.Entry(combat_frame, width=5, textvariable=temp_var)
         batt_entry.grid(row=0, column=7, padx=5, pady=5, sticky="w")
-        batt_var.set(str(character_data.get("battery", 0)))
+        batt_var.set(str(character.battery))
 
         ttk.Label(combat_frame, text="/").grid(row=0, column=8)
 
@@ -838,13 +1236,13 @@ class DigimonDNDApp:
         add_effect_btn = ttk.Button(
             effects_frame, 
             text="Add Effect", 
-            command=lambda: self.add_effect_row(effects_container, character_data)
+            command=lambda: self.add_effect_row(effects_container, view)
         )
         add_effect_btn.grid(row=3, column=0, padx=5, pady=10, sticky="w")
         
         # Add existing effects
-        for effect in character_data.get("effects", []):
-            self.add_effect_row(effects_container, character_data, effect)
+        for effect in character.effects:
+            self.add_effect_row(effects_container, view, effect)
 
         # Stats (with both display and DP entry)
         stats_frame = ttk.Frame(scrollable_frame)
@@ -859,6 +1257,19 @@ class DigimonDNDApp:
         misc_vars = {}
         misc_bonus_vars = {}
         
+        # Incremental stat calculation: only fields downstream of an edit are recomputed
+        stat_graph = digimon_stats.StatGraph()
+        input_vars = {}
+        output_vars = {}
+        
+        # Edits only mark fields dirty; one recalculation runs per idle cycle
+        recalc_scheduler = RecalcScheduler(
+            lifecycle,
+            lambda keys: self.recalculate(stat_graph, output_vars, {key: input_vars[key].get() for key in keys}),
+            self.recalc_delay_ms
+        )
+        lifecycle.on_close(recalc_scheduler.cancel)
+        
         # Stats setup
         stat_names = ["ACC", "DAM", "DOD", "ARM", "HP"]
         for i, stat in enumerate(stat_names):
@@ -877,32 +1288,22 @@ class DigimonDNDApp:
             # DP input
             ttk.Label(stat_frame, text="DP:").pack(pady=2)
             dp_vars[f"{stat.lower()}_dp"] = tk.StringVar()
-            dp_vars[f"{stat.lower()}_dp"].set(str(character_data["stats"].get(f"{stat.lower()}_dp", 0)))
+            dp_vars[f"{stat.lower()}_dp"].set(str(character.stats.get(f"{stat.lower()}_dp", 0)))
             dp_entry = ttk.Entry(stat_frame, width=5, textvariable=dp_vars[f"{stat.lower()}_dp"])
             dp_entry.pack(pady=2)
             
             # Bonus input
             ttk.Label(stat_frame, text="Qualities:").pack(pady=2)
             bonus_vars[f"{stat.lower()}_bonus"] = tk.StringVar()
-            bonus_vars[f"{stat.lower()}_bonus"].set(str(character_data["stats"].get(f"{stat.lower()}_bonus", 0)))
+            bonus_vars[f"{stat.lower()}_bonus"].set(str(character.stats.get(f"{stat.lower()}_bonus", 0)))
             bonus_entry = ttk.Entry(stat_frame, width=5, textvariable=bonus_vars[f"{stat.lower()}_bonus"])
             bonus_entry.pack(pady=2)
 
             # Bind calculation to DP and Bonus change
-            dp_vars[f"{stat.lower()}_dp"].trace_add("write", 
-                                                    lambda *args, s=stat.lower(): self.calculate_stats(
-                                                        stage_combo, size_combo, dp_vars, bonus_vars, stat_vars, 
-                                                        derived_vars, derived_bonus_vars, misc_vars, misc_bonus_vars, 
-                                                        max_health_var, max_batt_var, bonus_dp_var, quality_spent_var, 
-                                                        stat_spent_var, dp_spent_var, dp_allocated_var
-                                                    ))
-            bonus_vars[f"{stat.lower()}_bonus"].trace_add("write", 
-                                                    lambda *args, s=stat.lower(): self.calculate_stats(
-                                                        stage_combo, size_combo, dp_vars, bonus_vars, stat_vars, 
-                                                        derived_vars, derived_bonus_vars, misc_vars, misc_bonus_vars, 
-                                                        max_health_var, max_batt_var, bonus_dp_var, quality_spent_var, 
-                                                        stat_spent_var, dp_spent_var, dp_allocated_var
-                                                    ))
+            lifecycle.trace(dp_vars[f"{stat.lower()}_dp"],
+                lambda *args, s=stat.lower(): recalc_scheduler.mark_dirty(f"{s}_dp"))
+            lifecycle.trace(bonus_vars[f"{stat.lower()}_bonus"],
+                lambda *args, s=stat.lower(): recalc_scheduler.mark_dirty(f"{s}_bonus"))
             
         # Derived Stats
         derived_frame = ttk.Frame(scrollable_frame)
@@ -926,7 +1327,7 @@ class DigimonDNDApp:
             ttk.Label(derived_stat_frame, text="Qualities:").pack(pady=2)
             derived_bonus_vars[f"{stat.lower()}_bonus"] = tk.StringVar()
             derived_bonus_vars[f"{stat.lower()}_bonus"].set(
-                str(character_data["derived_stats"].get(f"{stat.lower()}_bonus", 0)
+                str(character.derived_stats.get(f"{stat.lower()}_bonus", 0)
                     ))
             derived_bonus_entry = ttk.Entry(derived_stat_frame, width=5,
                 textvariable=derived_bonus_vars[f"{stat.lower()}_bonus"]
@@ -934,13 +1335,8 @@ class DigimonDNDApp:
             derived_bonus_entry.pack(pady=2)
             
             # Bind calculation to derived stat bonus change
-            derived_bonus_vars[f"{stat.lower()}_bonus"].trace_add("write",
-                lambda *args, s=stat.lower(): self.calculate_stats(
-                    stage_combo, size_combo, dp_vars, bonus_vars, stat_vars, 
-                    derived_vars, derived_bonus_vars, misc_vars, misc_bonus_vars, 
-                    max_health_var, max_batt_var, bonus_dp_var, quality_spent_var, 
-                    stat_spent_var, dp_spent_var, dp_allocated_var
-                ))
+            lifecycle.trace(derived_bonus_vars[f"{stat.lower()}_bonus"],
+                lambda *args, s=stat.lower(): recalc_scheduler.mark_dirty(f"{s}_bonus"))
             
         # Misc Stats
         misc_frame = ttk.Frame(scrollable_frame)
@@ -966,7 +1362,7 @@ class DigimonDNDApp:
             ttk.Label(misc_stat_frame, text="Qualities:").pack(pady=2)
             misc_bonus_vars[f"{misc_keys[i]}_bonus"] = tk.StringVar()
             misc_bonus_vars[f"{misc_keys[i]}_bonus"].set(
-                str(character_data["misc_stats"].get(f"{misc_keys[i]}_bonus", 0))
+                str(character.misc_stats.get(f"{misc_keys[i]}_bonus", 0))
                 )
             misc_bonus_entry = ttk.Entry(
                 misc_stat_frame, width=5, textvariable=misc_bonus_vars[f"{misc_keys[i]}_bonus"]
@@ -974,39 +1370,43 @@ class DigimonDNDApp:
             misc_bonus_entry.pack(pady=2)
             
             # Bind calculation to misc stat bonus change
-            misc_bonus_vars[f"{misc_keys[i]}_bonus"].trace_add("write",
-                lambda *args, s=stat.lower(): self.calculate_stats(
-                    stage_combo, size_combo, dp_vars, bonus_vars, stat_vars, 
-                    derived_vars, derived_bonus_vars, misc_vars, misc_bonus_vars, 
-                    max_health_var, max_batt_var, bonus_dp_var, quality_spent_var, 
-                    stat_spent_var, dp_spent_var, dp_allocated_var
-                ))
+            lifecycle.trace(misc_bonus_vars[f"{misc_keys[i]}_bonus"],
+                lambda *args, s=misc_keys[i]: recalc_scheduler.mark_dirty(f"{s}_bonus"))
         
         # Bind stage change to stat recalculation
         stage_combo.bind("<<ComboboxSelected>>", 
-                        lambda event: self.calculate_stats(
-                            stage_combo, size_combo, dp_vars, bonus_vars, stat_vars, 
-                            derived_vars, derived_bonus_vars, misc_vars, misc_bonus_vars, 
-                            max_health_var, max_batt_var, bonus_dp_var, quality_spent_var, 
-                            stat_spent_var, dp_spent_var, dp_allocated_var
-                        ))
+                        lambda event: recalc_scheduler.mark_dirty("stage"))
         
         # Bind size change to stat recalculation
         size_combo.bind("<<ComboboxSelected>>", 
-                lambda event: self.calculate_stats(
-                    stage_combo, size_combo, dp_vars, bonus_vars, stat_vars, 
-                    derived_vars, derived_bonus_vars, misc_vars, misc_bonus_vars, 
-                    max_health_var, max_batt_var, bonus_dp_var, quality_spent_var, 
-                    stat_spent_var, dp_spent_var, dp_allocated_var
-                ))
-        
-        # Initial calculation
-        self.calculate_stats(
-            stage_combo, size_combo, dp_vars, bonus_vars, stat_vars, 
-            derived_vars, derived_bonus_vars, misc_vars, misc_bonus_vars, 
-            max_health_var, max_batt_var, bonus_dp_var, quality_spent_var, 
-            stat_spent_var, dp_spent_var, dp_allocated_var
-        )
+                lambda event: recalc_scheduler.mark_dirty("size"))
+        
+        # Every display variable the stat graph can write to
+        output_vars.update(stat_vars)
+        output_vars.update(derived_vars)
+        output_vars.update(misc_vars)
+        output_vars.update({
+            "max_health": max_health_var,
+            "max_batt": max_batt_var,
+            "stat_spent": stat_spent_var,
+            "dp_spent": dp_spent_var,
+            "dp_allocated": dp_allocated_var
+        })
+        
+        # Every widget/variable the stat graph reads from
+        input_vars.update({
+            "stage": stage_combo,
+            "size": size_combo,
+            "quality_spent": quality_spent_var,
+            "bonus_dp": bonus_dp_var
+        })
+        input_vars.update(dp_vars)
+        input_vars.update(bonus_vars)
+        input_vars.update(derived_bonus_vars)
+        input_vars.update(misc_bonus_vars)
+        
+        # Initial calculation (runs once the form is built)
+        recalc_scheduler.mark_dirty(*input_vars)
         
         # Attacks section
         attacks_frame = ttk.Frame(scrollable_frame)
@@ -1031,13 +1431,13 @@ class DigimonDNDApp:
         add_attack_btn = ttk.Button(
             attacks_frame, 
             text="Add Attack", 
-            command=lambda: self.add_attack_row(attacks_container, character_data)
+            command=lambda: self.add_attack_row(attacks_container, view)
         )
         add_attack_btn.grid(row=3, column=0, padx=5, pady=10, sticky="w")
         
         # Add existing attacks
-        for attack in character_data.get("attacks", []):
-            self.add_attack_row(attacks_container, character_data, attack)
+        for attack in character.attacks:
+            self.add_attack_row(attacks_container, view, attack)
         
         # Allocated DP Tracker
         allocated_frame = ttk.Frame(scrollable_frame)
@@ -1047,8 +1447,8 @@ class DigimonDNDApp:
             row=0, column=0, padx=5, pady=5, sticky="w"
         )
         
-        # Make sure these variables are included in your form_refs dictionary
-        character_data["_form_refs"].update({
+        # Make sure these variables are included in the view
+        view.update({
             "bonus_dp_var": bonus_dp_var,
             "quality_spent_var": quality_spent_var,
             "stat_spent_var": stat_spent_var,
@@ -1062,12 +1462,7 @@ class DigimonDNDApp:
         )
         bonus_dp_entry = ttk.Entry(allocated_frame, width=8, textvariable=bonus_dp_var)
         bonus_dp_entry.grid(row=1, column=1, padx=5, pady=5, sticky="w")
-        bonus_dp_var.trace_add("write", lambda *args: self.calculate_stats(
-            stage_combo, size_combo, dp_vars, bonus_vars, stat_vars, 
-            derived_vars, derived_bonus_vars, misc_vars, misc_bonus_vars, 
-            max_health_var, max_batt_var, bonus_dp_var, quality_spent_var, 
-            stat_spent_var, dp_spent_var, dp_allocated_var
-        ))
+        lifecycle.trace(bonus_dp_var, lambda *args: recalc_scheduler.mark_dirty("bonus_dp"))
         
         # Total DP Display
         ttk.Label(allocated_frame, text="Total DP Spent:").grid(row=1, column=2, padx=5, pady=5, sticky="e")
@@ -1083,12 +1478,7 @@ class DigimonDNDApp:
         )
         quality_spent_entry = ttk.Entry(allocated_frame, width=8, textvariable=quality_spent_var)
         quality_spent_entry.grid(row=2, column=1, padx=5, pady=5, sticky="w")
-        quality_spent_var.trace_add("write", lambda *args: self.calculate_stats(
-            stage_combo, size_combo, dp_vars, bonus_vars, stat_vars, 
-            derived_vars, derived_bonus_vars, misc_vars, misc_bonus_vars, 
-            max_health_var, max_batt_var, bonus_dp_var, quality_spent_var, 
-            stat_spent_var, dp_spent_var, dp_allocated_var
-        ))
+        lifecycle.trace(quality_spent_var, lambda *args: recalc_scheduler.mark_dirty("quality_spent"))
         
         # Stats Spent in Qualities
         ttk.Label(allocated_frame, text="Stat DP:").grid(
@@ -1107,15 +1497,41 @@ class DigimonDNDApp:
         qualities_text = tk.Text(qualities_frame, height=10, width=80, wrap="word", 
                               bg=theme["secondary_bg"], fg=theme["text"])
         qualities_text.pack(fill="both", expand=True, pady=5)
-        qualities_text.insert("1.0", character_data.get("qualities", ""))
+        qualities_text.insert("1.0", character.qualities)
         
         # Scrollbar for qualities text
         qualities_scroll = ttk.Scrollbar(qualities_text, command=qualities_text.yview)
         qualities_text.configure(yscrollcommand=qualities_scroll.set)
         qualities_scroll.pack(side="right", fill="y")
         
+        # Field-level change tracking: every edit records which top-level field
+        # of the character data has to be read back from the form on the next save
+        dirty_fields = set()
+        field_vars = [
+            ("name", name_var), ("digimon", digimon_var), ("stage", stage_var),
+            ("size", size_var), ("attribute", attr_var), ("type", type_var),
+            ("wound_boxes", wound_var), ("temp_boxes", temp_var), ("battery", batt_var),
+            ("bonus_dp_var", bonus_dp_var), ("quality_spent_var", quality_spent_var),
+            ("stat_spent_var", stat_spent_var), ("dp_spent_var", dp_spent_var),
+            ("dp_allocated_var", dp_allocated_var)
+        ]
+        field_vars += [("stats", var) for var in list(dp_vars.values()) + list(bonus_vars.values())]
+        field_vars += [("derived_stats", var) for var in derived_bonus_vars.values()]
+        field_vars += [("misc_stats", var) for var in misc_bonus_vars.values()]
+        for field, var in field_vars:
+            lifecycle.trace(var, lambda *args, f=field: dirty_fields.add(f))
+        
+        def _on_qualities_modified(event):
+            if qualities_text.edit_modified():
+                dirty_fields.add("qualities")
+                qualities_text.edit_modified(False)
+        
+        qualities_text.edit_modified(False)
+        qualities_text.bind("<<Modified>>", _on_qualities_modified)
+        
         # Store references to form elements for later data collection
-        character_data["_form_refs"] = {
+        view.update({
+            "canvas": canvas,
             "name_entry": name_entry,
             "digimon_entry": digimon_entry,
             "stage_combo": stage_combo,
@@ -1136,162 +1552,47 @@ class DigimonDNDApp:
             "quality_spent_var": quality_spent_var,
             "stat_spent_var": stat_spent_var,
             "dp_spent_var": dp_spent_var,
-            "dp_allocated_var": dp_allocated_var
-            # Attacks will be collected separately
-            # Effects will be collected separately
-        }
+            "dp_allocated_var": dp_allocated_var,
+            "stat_graph": stat_graph,
+            "output_vars": output_vars,
+            "recalc_scheduler": recalc_scheduler,
+            "field_vars": field_vars,
+            "dirty_fields": dirty_fields
+            # Attacks are collected from view["attack_rows"]
+            # Effects are collected from view["effect_rows"]
+        })
+        
+        # Typing in any field marks the sheet for autosave
+        self.tag_sheet_widgets(parent_frame)
+        
+        return view
     
-    def calculate_stats(self, stage_combo, size_combo, dp_vars, bonus_vars, stat_vars, derived_vars, derived_bonus_vars, misc_vars, misc_bonus_vars, max_health_var, max_batt_var, bonus_dp_var, quality_spent_var, stat_spent_var, dp_spent_var, dp_allocated_var):
+    def recalculate(self, stat_graph, output_vars, changes):
+        # Push the changed inputs through the sheet's stat graph and only
+        # write the display variables whose value actually changed
+        started = time.perf_counter()
+        metrics.incr("recalculations")
         try:
-            # Get stage value (1-5)
-            stage_values = {"Baby": 1, "Child": 2, "Adult": 3, "Perfect": 4, "Ultimate": 5}
-            stage_value = stage_values.get(stage_combo.get(), 1)  # Default to Child if invalid
-            
-            # Get size value (1-6)
-            size_values = {"Small": 1, "Medium": 2, "Large": 3, "Huge": 4, "Gigantic": 5, "Colossal": 6}
-            size_value = size_values.get(size_combo.get(), 2) #Default to Medium if invalid 
-
-            # Calculate which size bonus to inherit
-            if size_value == 1:
-                size_bit = 1
-                size_dos = 0
-                size_ram = 2
-                size_cpu = 0
-            if size_value == 2:
-                size_bit = 1
-                size_dos = 0
-                size_ram = 1
-                size_cpu = 0
-
-            if size_value == 3:
-                size_bit = 1
-                size_dos = 0
-                size_ram = 0
-                size_cpu = 1
-            
-            if size_value == 4:
-                size_bit = 0
-                size_dos = 1
-                size_ram = 0
-                size_cpu = 1
-            
-            if size_value > 5:
-                size_bit = 0
-                size_dos = 1
-                size_ram = 0
-                size_cpu = 2
-
-            # Calculate primary stats
-            for stat in ["acc", "dam", "dod", "arm", "hp"]:
-                dp = int(dp_vars.get(f"{stat}_dp").get() or 0)
-                bonus = int(bonus_vars.get(f"{stat}_bonus").get() or 0)
-                stat_value = stage_value + dp + bonus
-                stat_vars[stat].set(str(stat_value))
-            
-            # Calculate Derived stats
-            # for stat in ["acc"]
-            
-            acc_stat = int(stat_vars["acc"].get())
-            dam_stat = int(stat_vars["dam"].get())
-            dod_stat = int(stat_vars["dod"].get())
-            arm_stat = int(stat_vars["arm"].get())
-            hp_stat = int(stat_vars["hp"].get())
-
-            acc_bonus = int(bonus_vars.get("acc_bonus").get() or 0)
-            dam_bonus = int(bonus_vars.get("dam_bonus").get() or 0)
-            dod_bonus = int(bonus_vars.get("dod_bonus").get() or 0)
-            arm_bonus = int(bonus_vars.get("arm_bonus").get() or 0)
-            hp_bonus = int(bonus_vars.get("hp_bonus").get() or 0)
-
-            # Calulate derived stat bonuses
-            bit_bonus = int(derived_bonus_vars.get("bit_bonus").get() or 0)
-            dos_bonus = int(derived_bonus_vars.get("dos_bonus").get() or 0)
-            ram_bonus = int(derived_bonus_vars.get("ram_bonus").get() or 0)
-            cpu_bonus = int(derived_bonus_vars.get("cpu_bonus").get() or 0)
-
-            bit_value = max(1, math.floor((acc_stat - acc_bonus) / 3)) + bit_bonus + size_bit
-            dos_value = max(1, math.floor((dam_stat - dam_bonus) / 3)) + dos_bonus + size_dos
-            ram_value = max(1, math.floor((dod_stat - dod_bonus) / 3)) + ram_bonus + size_ram
-            cpu_value = max(1, math.floor((arm_stat - arm_bonus) / 3)) + cpu_bonus + size_cpu
-
-            derived_vars["bit"].set(str(bit_value))
-            derived_vars["dos"].set(str(dos_value))
-            derived_vars["ram"].set(str(ram_value))
-            derived_vars["cpu"].set(str(cpu_value))
-            
-            print((derived_vars["bit"]).get());
-            print((derived_vars["dos"]).get());
-            print((derived_vars["ram"]).get());
-            print((derived_vars["cpu"]).get());
-            
-            # Calculate max health
-            max_health = (hp_stat * 2) + (stage_value - 1) - hp_bonus
-            max_health_var.set(str(max_health))
-
-            # Calculate max battery
-            max_batt = stage_value - 1
-            max_batt_var.set(str(max_batt))
-
-            # Calculate misc stats
-            bit_stat = int(derived_vars["bit"].get())
-            ram_stat = int(derived_vars["ram"].get())
-
-            move_bonus = int(misc_bonus_vars["move_bonus"].get() or 0)
-            init_bonus = int(misc_bonus_vars["init_bonus"].get() or 0)
-            range_bonus = int(misc_bonus_vars["range_bonus"].get() or 0)
-            max_range_bonus = int(misc_bonus_vars["max_range_bonus"].get() or 0)
-
-            move_stat = stage_value + 1 + move_bonus
-            init_stat = ram_stat + init_bonus
-            range_stat = bit_stat + 3 + range_bonus
-            max_range_stat = range_stat + (stage_value - 1) + max_range_bonus
-
-            misc_vars["move"].set(str(move_stat))
-            misc_vars["init"].set(str(init_stat))
-            misc_vars["range"].set(str(range_stat))
-            misc_vars["max_range"].set(str(max_range_stat))
-            
-            # Calculate DP spent in stats
-            stats_spent = 0
-            for stat in ["acc", "dam", "dod", "arm", "hp"]:
-                dp_value = int(dp_vars.get(f"{stat}_dp").get() or 0)
-                stats_spent += dp_value
-            stat_spent_var.set(str(stats_spent))
-
-            # Get DP spent in Qualities
-            quality_spent = int(quality_spent_var.get() or 0)
-
-            # Calculate total DP spent
-            total_dp_spent = stats_spent + quality_spent
-            dp_spent_var.set(str(total_dp_spent))
-
-            # Get bonus DP allocated from entry
-            bonus_dp_allocated = int(bonus_dp_var.get() or 0)
-
-            # Calculate max DP allocated (10 per stage level plus bonus)
-            stage_values = {"Baby": 1, "Child": 2, "Adult": 3, "Perfect": 4, "Ultimate": 5}
-            stage_value = stage_values.get(stage_combo.get(), 2)  # Default to Child if invalid
-            max_dp_allocated = ((stage_value - 1) * 10) + bonus_dp_allocated
-            dp_allocated_var.set(str(max_dp_allocated))
+            try:
+                results = stat_graph.update(changes)
+            except Exception as e:
+                metrics.error("recalculate", ", ".join(stat_graph.error_fields), e)
+                # Keep values as-is in case of error
+                return
 
-        except Exception as e:
-            print(f"Error calculating stats: {str(e)}")
-            # Keep values as-is in case of error
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Recalculated %s -> %s", sorted(changes), results)
+            for key, value in results.items():
+                output_vars[key].set(str(value))
+        finally:
+            # Failed recalculations count towards the latency too
+            metrics.observe("recalculate", (time.perf_counter() - started) * 1000)
     
-    def add_effect_row(self, parent, character_data, effect_data=None):
-        print("Adding Effect...")
-        if "effects" not in character_data:
-            character_data["effects"] = []
-        elif not isinstance(character_data["effects"], list):
-            character_data["effects"] = [character_data["effects"]] if character_data["effects"] else []
-        
-        if effect_data is None:
-            effect_data = {
-                "eff_name": "",
-                "potency": 0,
-                "duration": 0,
-            }
-            character_data["effects"].append(effect_data)
+    def add_effect_row(self, parent, view, effect=None):
+        metrics.incr("effect_rows_built")
+        if effect is None:
+            effect = Effect()
+            self.mark_widget_sheet_dirty(parent)
         
         # Create row frame
         effect_index = len(parent.winfo_children())
@@ -1301,17 +1602,26 @@ class DigimonDNDApp:
         # Effect name
         effect_name = ttk.Entry(row_frame2, width=10)
         effect_name.grid(row=0, column=0, padx=5)
-        effect_name.insert(0, effect_data.get("eff_name", ""))
+        effect_name.insert(0, effect.eff_name)
         
         # Potency
         potency = ttk.Entry(row_frame2, width=8)
         potency.grid(row=0, column=1, padx=5)
-        potency.insert(0, effect_data.get("potency", ""))
+        potency.insert(0, effect.potency)
         
         # Type dropdown
         duration = ttk.Entry(row_frame2, width=8)
         duration.grid(row=0, column=2, padx=5)
-        duration.insert(0,effect_data.get("duration", ""))
+        duration.insert(0, effect.duration)
+        
+        # Store references for data collection
+        row_refs = {
+            "eff_name": effect_name,
+            "potency": potency,
+            "duration": duration,
+            "row_frame2": row_frame2
+        }
+        view["effect_rows"].append(row_refs)
         
         # Remove button
         if effect_index >= 0: 
@@ -1319,43 +1629,28 @@ class DigimonDNDApp:
                 row_frame2, 
                 text="-", 
                 width=2,
-                command=lambda: self.remove_effect(row_frame2, character_data, effect_index)
+                command=lambda: self.remove_effect(row_frame2, view, row_refs)
             )
             remove_btn.grid(row=0, column=5, padx=5)
         
-        # Store references for data collection
-        effect_data["_form_refs"] = {
-            "eff_name": effect_name,
-            "potency": potency,
-            "duration": duration,
-            "row_frame2": row_frame2
-        }
+        # Typing in the row marks the sheet for autosave and the row for re-reading
+        row_frame2.row_refs = row_refs
+        self.tag_sheet_widgets(row_frame2)
 
-    def remove_effect(self, row_frame2, character_data, index):
+    def remove_effect(self, row_frame2, view, row_refs):
         # Remove from UI
+        self.mark_widget_sheet_dirty(row_frame2)
         row_frame2.destroy()
         
-        # Remove from data structure
-        if index < len(character_data["effects"]):
-            character_data["effects"].pop(index)
-        
-        # Reindex remaining effects
-        # This is important for proper saving later
-        for i, effect in enumerate(character_data["effects"]):
-            if "_form_refs" in effect and "row_frame2" in effect["_form_refs"]:
-                effect["_form_refs"]["row_frame2"].update_idletasks()
+        # Remove from the view; the model picks this up on the next snapshot
+        if row_refs in view["effect_rows"]:
+            view["effect_rows"].remove(row_refs)
 
-    def add_attack_row(self, parent, character_data, attack_data=None):
-        print("Adding Attack...")
-        if attack_data is None:
-            attack_data = {
-                "name": "",
-                "accuracy": 0,
-                "type": "Melee",
-                "damage": 0,
-                "tags": ["", "", ""]
-            }
-            character_data["attacks"].append(attack_data)
+    def add_attack_row(self, parent, view, attack=None):
+        metrics.incr("attack_rows_built")
+        if attack is None:
+            attack = Attack()
+            self.mark_widget_sheet_dirty(parent)
         
         # Create row frame
         attack_index = len(parent.winfo_children())
@@ -1365,22 +1660,22 @@ class DigimonDNDApp:
         # Attack name
         attack_name = ttk.Entry(row_frame, width=20)
         attack_name.grid(row=0, column=0, padx=5)
-        attack_name.insert(0, attack_data.get("name", ""))
+        attack_name.insert(0, attack.name)
         
         # Accuracy
         accuracy = ttk.Entry(row_frame, width=8)
         accuracy.grid(row=0, column=1, padx=5)
-        accuracy.insert(0, attack_data.get("accuracy", ""))
+        accuracy.insert(0, attack.accuracy)
         
         # Type dropdown
         attack_type = ttk.Combobox(row_frame, values=["Melee", "Ranged", "Support"], width=10)
         attack_type.grid(row=0, column=2, padx=5)
-        attack_type.set(attack_data.get("type", "Melee"))
+        attack_type.set(attack.type)
         
         # Damage
         damage = ttk.Entry(row_frame, width=8)
         damage.grid(row=0, column=3, padx=5)  
-        damage.insert(0, attack_data.get("damage", ""))
+        damage.insert(0, attack.damage)
         
         # Tags (3 fields)
         tags_frame = ttk.Frame(row_frame)
@@ -1390,45 +1685,52 @@ class DigimonDNDApp:
         for i in range(3):
             tag = ttk.Entry(tags_frame, width=10)
             tag.pack(side="left", padx=2)
-            tag.insert(0, attack_data.get("tags", ["", "", ""])[i] if i < len(attack_data.get("tags", [])) else "")
+            tag.insert(0, attack.tags[i] if i < len(attack.tags) else "")
             tag_entries.append(tag)
         
+        # Store references for data collection
+        row_refs = {
+            "name": attack_name,
+            "accuracy": accuracy,
+            "type": attack_type,
+            "damage": damage,
+            "tags": tag_entries,
+            "row_frame": row_frame
+        }
+        view["attack_rows"].append(row_refs)
+        
         # Remove button (except for first attack)
         if attack_index > 0:
             remove_btn = ttk.Button(
                 row_frame, 
                 text="-", 
                 width=2,
-                command=lambda: self.remove_attack(row_frame, character_data, attack_index)
+                command=lambda: self.remove_attack(row_frame, view, row_refs)
             )
             remove_btn.grid(row=0, column=5, padx=5)
         
-        # Store references for data collection
-        attack_data["_form_refs"] = {
-            "name": attack_name,
-            "accuracy": accuracy,
-            "type": attack_type,
-            "damage": damage,
-            "tags": tag_entries,
-            "row_frame": row_frame
-        }
+        # Typing in the row marks the sheet for autosave and the row for re-reading
+        row_frame.row_refs = row_refs
+        self.tag_sheet_widgets(row_frame)
     
-    def remove_attack(self, row_frame, character_data, index):
+    def remove_attack(self, row_frame, view, row_refs):
         # Remove from UI
+        self.mark_widget_sheet_dirty(row_frame)
         row_frame.destroy()
         
-        # Remove from data structure
-        if index < len(character_data["attacks"]):
-            character_data["attacks"].pop(index)
-        
-        # Reindex remaining attacks
-        # This is important for proper saving later
-        for i, attack in enumerate(character_data["attacks"]):
-            if "_form_refs" in attack and "row_frame" in attack["_form_refs"]:
-                attack["_form_refs"]["row_frame"].update_idletasks()
+        # Remove from the view; the model picks this up on the next snapshot
+        if row_refs in view["attack_rows"]:
+            view["attack_rows"].remove(row_refs)
 
 # Run the application
 if __name__ == "__main__":
+    configure_logging()
+    trace_path = os.environ.get("DIGIMON_TRACE")
+    if trace_path:
+        tracer.start()
     root = tk.Tk()
     app = DigimonDNDApp(root)
     root.mainloop()
+    if trace_path:
+        tracer.stop()
+        tracer.save(trace_path)
@@ -0,0 +1,86 @@
+"""Shared theme artwork.
+
+Each theme's PNG is decoded into a single tk.PhotoImage and shared by
+every widget that shows it. preload() reads the files on a background
+thread and then decodes them one per idle callback on the Tk thread, so
+once that has caught up a theme switch only looks up a ready image. A
+switch to a theme that isn't decoded yet decodes it on the spot.
+"""
+import base64
+import threading
+import tkinter as tk
+
+from digimon_resources import resource_path
+
+
+class ThemeImageCache:
+    def __init__(self, root, image_files):
+        # image_files: theme name -> image file name (relative to resource_path)
+        self.root = root
+        self.image_files = dict(image_files)
+        # theme name -> base64 PNG data read ahead of time by preload()
+        self._data = {}
+        # (theme name, subsample factor) -> tk.PhotoImage
+        self._images = {}
+        self._preload_thread = None
+        self._decode_job = None
+
+    def get(self, theme_name, subsample=1):
+        # Returns the shared PhotoImage for a theme, optionally shrunk by subsample
+        key = (theme_name, subsample)
+        image = self._images.get(key)
+        if image is not None:
+            return image
+
+        if subsample == 1:
+            data = self._data.pop(theme_name, None)
+            if data is not None:
+                image = tk.PhotoImage(master=self.root, data=data)
+            else:
+                image = tk.PhotoImage(master=self.root, file=resource_path(self.image_files[theme_name]))
+        else:
+            image = self.get(theme_name).subsample(subsample)
+
+        self._images[key] = image
+        return image
+
+    def preload(self, background=True):
+        # Reads every theme image from disk ahead of time and decodes it.
+        # PhotoImages can only be made on the Tk thread, so the file reads
+        # run on a background thread and the decoding in idle callbacks.
+        if background:
+            self._preload_thread = threading.Thread(target=self._read_all, daemon=True)
+            self._preload_thread.start()
+            self._decode_job = self.root.after_idle(self._decode_next)
+        else:
+            self._read_all()
+            for theme_name in self.image_files:
+                self.get(theme_name)
+
+    def _read_all(self):
+        for theme_name, file_name in self.image_files.items():
+            if theme_name in self._data or (theme_name, 1) in self._images:
+                continue
+            try:
+                with open(resource_path(file_name), "rb") as file:
+                    self._data[theme_name] = base64.b64encode(file.read()).decode("ascii")
+            except OSError:
+                # get() falls back to loading from the file directly
+                pass
+
+    def _decode_next(self):
+        # Decodes one preloaded image, then gives the event loop a turn
+        self._decode_job = None
+        pending = [name for name in self.image_files if (name, 1) not in self._images]
+        ready = next((name for name in pending if name in self._data), None)
+        if ready is not None:
+            self.get(ready)
+            self._decode_job = self.root.after_idle(self._decode_next)
+        elif pending and self._preload_thread is not None and self._preload_thread.is_alive():
+            # Still reading from disk
+            self._decode_job = self.root.after(20, self._decode_next)
+        # Otherwise everything is decoded, or the rest couldn't be read and
+        # get() loads it from its file when it is needed
+
+    def image_count(self):
+        return len(self._images)
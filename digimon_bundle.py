@@ -0,0 +1,305 @@
+"""Campaign bundles: many character sheets in one file.
+
+A bundle starts with a fixed-size header pointing at an index of its
+members; each member's latest sheet is a record found by seeking to its
+offset, so one character is read without parsing anything else, and the
+member list comes from the index alone. The file is memory-mapped for
+reads.
+
+Saving a member never rewrites the file: the new version and a new index
+are appended and only then does the header switch to the new index, so a
+crash mid-save leaves the previous state readable. Old versions are dead
+space until the bundle is compacted, which happens on a background thread
+once there is more dead space than live data.
+
+    HEADER   magic, index offset, index length, generation
+    RECORD   one sheet, as JSON text (appended, never changed)
+    ...
+    INDEX    JSON: {"members": {name: {"offset", "length", "versions", ...}}}
+
+A member of a bundle is addressed as "<bundle path>::<member name>", which
+digimon_io accepts anywhere a sheet file path is expected. Member names
+can't contain path separators or "::", so such a path never resolves to
+anything but its bundle.
+
+Open bundles are shared through open_bundle() and stay open (and, on
+Windows, locked) until close_bundle() releases them.
+"""
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+BUNDLE_SUFFIX = ".digibundle"
+MEMBER_SEPARATOR = "::"
+
+_MAGIC = b"DGBUNDL1"
+_HEADER = struct.Struct("<8sQQQ")
+# Compact once dead space passes both the live data and this
+COMPACT_MIN_DEAD_BYTES = 1 << 20
+
+
+class BundleError(ValueError):
+    pass
+
+
+def check_member_name(name):
+    # Raises BundleError for names that would read as part of a path
+    if not name.strip():
+        raise BundleError("A bundle member needs a name")
+    if "/" in name or "\\" in name or MEMBER_SEPARATOR in name or name.strip(".") == "":
+        raise BundleError(f"{name!r} can't be used as a name in a bundle "
+                          f"(no /, \\ or {MEMBER_SEPARATOR}, and not just dots)")
+
+
+def member_path(bundle_path, name):
+    check_member_name(name)
+    return f"{bundle_path}{MEMBER_SEPARATOR}{name}"
+
+
+def split_member_path(file_path):
+    # (bundle path, member name) for a bundle member path, else None.
+    # Raises BundleError if the member name isn't a valid one.
+    bundle_path, separator, name = file_path.partition(MEMBER_SEPARATOR)
+    if not separator or not bundle_path.lower().endswith(BUNDLE_SUFFIX):
+        return None
+    check_member_name(name)
+    return bundle_path, name
+
+
+def bundle_key(file_path):
+    # Spellings of the same bundle file map to the same key
+    return os.path.normcase(os.path.realpath(file_path))
+
+
+class CampaignBundle:
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.lock = threading.RLock()
+        self.compacting = None
+        self._file = None
+        self._map = None
+        if not os.path.exists(file_path):
+            self._write_empty()
+        self._open()
+
+    def _write_empty(self):
+        index = self._encode_index({})
+        with open(self.file_path, 'xb') as file:
+            file.write(_HEADER.pack(_MAGIC, _HEADER.size, len(index), 0))
+            file.write(index)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _open(self):
+        self._file = open(self.file_path, 'r+b')
+        try:
+            self._remap()
+            magic, index_offset, index_length, self.generation = _HEADER.unpack_from(self._map, 0)
+            if magic != _MAGIC:
+                raise BundleError(f"{os.path.basename(self.file_path)} is not a campaign bundle")
+            self.members = json.loads(self._map[index_offset:index_offset + index_length])["members"]
+        except Exception:
+            self.close()
+            raise
+        self.index_length = index_length
+
+    def _ensure_open(self):
+        # A bundle released by close_bundle() while a save or compaction
+        # was still on its way reopens for it
+        if self._file is None:
+            self._open()
+
+    def _remap(self):
+        # The map covers the file as it was when mapped; appends need a new one
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        with self.lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    @staticmethod
+    def _encode_index(members):
+        return json.dumps({"members": members}, separators=(",", ":")).encode("utf-8")
+
+    def list_members(self):
+        # {name: index entry}, straight from the index; no member is decoded
+        with self.lock:
+            return {name: dict(entry) for name, entry in self.members.items()}
+
+    def __contains__(self, name):
+        return name in self.members
+
+    def read_bytes(self, name):
+        with self.lock:
+            entry = self.members.get(name)
+            if entry is None:
+                raise KeyError(f"{name} is not in {os.path.basename(self.file_path)}")
+            self._ensure_open()
+            return self._map[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def read(self, name):
+        return json.loads(self.read_bytes(name))
+
+    def append(self, name, payload, info=None):
+        # Adds a new version of member name (payload: the sheet's JSON as bytes).
+        # info: small extra fields stored in the index for listings.
+        check_member_name(name)
+        with self.lock:
+            self._ensure_open()
+            members = dict(self.members)
+            previous = members.get(name)
+            entry = dict(info or {})
+
+            self._file.seek(0, os.SEEK_END)
+            entry["offset"] = self._file.tell()
+            entry["length"] = len(payload)
+            entry["versions"] = (previous["versions"] if previous else 0) + 1
+            entry["saved"] = time.time()
+            members[name] = entry
+            index = self._encode_index(members)
+
+            # Record and index first; the header only points at them once they are on disk
+            self._file.write(payload)
+            self._file.write(index)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.seek(0)
+            self._file.write(_HEADER.pack(_MAGIC, entry["offset"] + len(payload), len(index), self.generation + 1))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+            self.members = members
+            self.index_length = len(index)
+            self.generation += 1
+            self._remap()
+
+        if self.needs_compaction():
+            self.compact_in_background()
+        return entry
+
+    def live_bytes(self):
+        return sum(entry["length"] for entry in self.members.values())
+
+    def dead_bytes(self):
+        # Old versions and old indexes
+        with self.lock:
+            self._ensure_open()
+            return len(self._map) - _HEADER.size - self.index_length - self.live_bytes()
+
+    def needs_compaction(self):
+        dead = self.dead_bytes()
+        return dead > COMPACT_MIN_DEAD_BYTES and dead > self.live_bytes()
+
+    def compact_in_background(self):
+        # Starts compact() on a daemon thread unless one is already running
+        with self.lock:
+            if self.compacting is not None and self.compacting.is_alive():
+                return self.compacting
+            self.compacting = threading.Thread(target=self.compact, name="bundle-compaction", daemon=True)
+            self.compacting.start()
+            return self.compacting
+
+    def compact(self):
+        # Rewrites the bundle with only the latest version of each member.
+        # Records are copied from a snapshot without holding the lock; members
+        # saved meanwhile are copied again before the new file is swapped in.
+        with self.lock:
+            snapshot = {name: dict(entry) for name, entry in self.members.items()}
+            generation = self.generation
+
+        folder = os.path.dirname(os.path.abspath(self.file_path))
+        fd, temp_path = tempfile.mkstemp(dir=folder, prefix="." + os.path.basename(self.file_path) + ".",
+                                         suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w+b') as temp:
+                temp.write(b"\0" * _HEADER.size)
+                members = {}
+                with open(self.file_path, 'rb') as source:
+                    for name, entry in snapshot.items():
+                        source.seek(entry["offset"])
+                        members[name] = self._copy_record(temp, source.read(entry["length"]), entry)
+
+                with self.lock:
+                    if self.generation != generation:
+                        for name, entry in self.members.items():
+                            if snapshot.get(name) != entry:
+                                members[name] = self._copy_record(temp, self.read_bytes(name), entry)
+
+                    index = self._encode_index(members)
+                    index_offset = temp.tell()
+                    temp.write(index)
+                    temp.seek(0)
+                    temp.write(_HEADER.pack(_MAGIC, index_offset, len(index), self.generation))
+                    temp.flush()
+                    os.fsync(temp.fileno())
+                    os.chmod(temp_path, os.stat(self.file_path).st_mode & 0o777)
+
+                    # Windows can't replace a file that is still open or mapped
+                    self.close()
+                    try:
+                        os.replace(temp_path, self.file_path)
+                    finally:
+                        self._open()
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _copy_record(temp, payload, entry):
+        entry = dict(entry)
+        entry["offset"] = temp.tell()
+        temp.write(payload)
+        return entry
+
+
+# One CampaignBundle per bundle file, shared by the UI and the I/O threads.
+# _bundles_by_path remembers each spelling seen, so reads skip resolving the path.
+_bundles = {}
+_bundles_by_path = {}
+_bundles_lock = threading.Lock()
+
+
+def open_bundle(file_path):
+    # The shared CampaignBundle for file_path, creating the file if needed
+    bundle = _bundles_by_path.get(file_path)
+    if bundle is not None:
+        return bundle
+    key = bundle_key(file_path)
+    with _bundles_lock:
+        bundle = _bundles.get(key)
+        if bundle is None:
+            bundle = _bundles[key] = CampaignBundle(file_path)
+        _bundles_by_path[file_path] = bundle
+        return bundle
+
+
+def open_bundles():
+    with _bundles_lock:
+        return list(_bundles.values())
+
+
+def close_bundle(file_path):
+    # Closes the shared bundle for file_path and forgets it; a later
+    # open_bundle() opens the file again
+    key = bundle_key(file_path)
+    with _bundles_lock:
+        bundle = _bundles.pop(key, None)
+        for path, cached in list(_bundles_by_path.items()):
+            if cached is bundle:
+                del _bundles_by_path[path]
+    if bundle is not None:
+        bundle.close()
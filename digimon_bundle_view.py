@@ -0,0 +1,130 @@
+"""Window listing the members of a campaign bundle.
+
+The list comes straight from the bundle's index, so even a large campaign
+shows up at once; sheets are only read when they are opened. Opened
+members save back into the bundle as new versions.
+"""
+import os
+import time
+import tkinter as tk
+from concurrent.futures import wait
+from tkinter import messagebox, simpledialog, ttk
+
+import digimon_io
+from digimon_bundle import BundleError, member_path
+
+COLUMNS = [
+    ("digimon", "Digimon", 120),
+    ("stage", "Stage", 80),
+    ("versions", "Versions", 70),
+    ("saved", "Last Saved", 140),
+]
+
+
+class BundleWindow:
+    def __init__(self, app, bundle):
+        self.app = app
+        self.bundle = bundle
+
+        self.window = tk.Toplevel(app.root)
+        self.window.title(f"Campaign Bundle - {os.path.basename(bundle.file_path)}")
+        self.window.transient(app.root)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        frame = ttk.Frame(self.window)
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.tree = ttk.Treeview(frame, columns=[key for key, _, _ in COLUMNS], selectmode="extended")
+        self.tree.heading("#0", text="Character")
+        self.tree.column("#0", width=160)
+        for key, label, width in COLUMNS:
+            self.tree.heading(key, text=label)
+            self.tree.column(key, width=width)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.bind("<Double-1>", lambda event: self.open_selected())
+
+        self.status = ttk.Label(self.window)
+        self.status.pack(fill="x", padx=10)
+
+        buttons = ttk.Frame(self.window)
+        buttons.pack(fill="x", padx=10, pady=(5, 10))
+        ttk.Button(buttons, text="Open", command=self.open_selected).pack(side="left", padx=(0, 5))
+        ttk.Button(buttons, text="Add Current Sheet", command=self.add_current_sheet).pack(side="left", padx=5)
+        ttk.Button(buttons, text="Close", command=self.close).pack(side="right")
+
+        self.refresh()
+
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        members = self.bundle.list_members()
+        for name, entry in members.items():
+            saved = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["saved"]))
+            self.tree.insert("", "end", iid=name, text=name,
+                             values=(entry.get("digimon", ""), entry.get("stage", ""), entry["versions"], saved))
+        self.status.config(text=f"{len(members)} character{'s' if len(members) != 1 else ''}")
+
+    def close(self):
+        self.window.destroy()
+        self.app.bundle_windows.remove(self)
+        self.app.release_unused_bundles()
+
+    def open_selected(self):
+        names = self.tree.selection()
+        if not names:
+            messagebox.showinfo("Info", "Select the characters to open", parent=self.window)
+            return
+        self.app.open_sheet_files([member_path(self.bundle.file_path, name) for name in names])
+
+    def add_current_sheet(self):
+        app = self.app
+        sheet_info = app.open_sheets.by_tab(app.notebook.select())
+        if not sheet_info:
+            messagebox.showinfo("Info", "No character sheet is open", parent=self.window)
+            return
+
+        try:
+            app.flush_recalculation(sheet_info)
+            clean_data = app.get_updated_character_data(sheet_info)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not read the character sheet: {str(e)}", parent=self.window)
+            return
+
+        name = simpledialog.askstring("Add to Bundle", "Character name in the bundle:",
+                                      initialvalue=clean_data.get("name") or sheet_info["name"],
+                                      parent=self.window)
+        if not name:
+            return
+        try:
+            file_path = member_path(self.bundle.file_path, name)
+        except BundleError as e:
+            messagebox.showerror("Error", str(e), parent=self.window)
+            return
+        other_sheet = app.open_sheets.by_path(file_path)
+        if other_sheet and other_sheet is not sheet_info:
+            messagebox.showerror("Error", f"{name} is already open in another tab", parent=self.window)
+            return
+        if name in self.bundle and not messagebox.askyesno(
+                "Add to Bundle", f"{name} is already in the bundle. Save this sheet as its new version?",
+                parent=self.window):
+            return
+
+        if sheet_info.get("save_future"):
+            wait([sheet_info["save_future"]])
+        try:
+            sheet_info["saved_digest"] = digimon_io.write_sheet_file(file_path, clean_data)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not save to the bundle: {str(e)}", parent=self.window)
+            return
+
+        # The tab now saves into the bundle
+        sheet_info["dirty"] = False
+        app.open_sheets.set_file_path(sheet_info, file_path)
+        tab_name = os.path.basename(file_path)
+        app.notebook.tab(sheet_info["frame"], text=tab_name)
+        sheet_info["name"] = tab_name
+        # The sheet may have moved here from another bundle
+        app.release_unused_bundles()
+        self.refresh()
@@ -0,0 +1,144 @@
+"""Command line batch mode for character sheet files.
+
+Recomputes the stats of every sheet in a folder without starting the GUI
+(tkinter is never imported), reports sheets that spend more DP than they
+have allocated or don't fit the sheet schema, and can rewrite the stored DP
+totals. With --write, sheets from older versions of the app are migrated to
+the current schema in the same pass.
+
+    python digimon_cli.py campaign_folder/
+    python digimon_cli.py campaign_folder/ --recursive --write
+    python digimon_cli.py campaign_folder/ --rules house_rules.json
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import digimon_io
+import digimon_stats
+from digimon_model import Character
+from digimon_schema import prepare_sheet
+
+# Stored sheet fields that hold calculated values -> stat engine output
+STORED_FIELDS = {
+    "stat_spent_var": "stat_spent",
+    "dp_spent_var": "dp_spent",
+    "dp_allocated_var": "dp_allocated",
+}
+
+
+def collect_sheet_files(paths, recursive=False):
+    file_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            if recursive:
+                for folder, _, _ in sorted(os.walk(path)):
+                    file_paths.extend(digimon_io.list_sheet_files(folder))
+            else:
+                file_paths.extend(digimon_io.list_sheet_files(path))
+        else:
+            file_paths.append(path)
+    return file_paths
+
+
+def process_sheet_file(file_path, write=False):
+    # Runs in a worker process; returns a plain dict so it pickles cheaply
+    result = {"file_path": file_path, "error": None, "over_allocated": False, "rewritten": False,
+              "migrated": False}
+    try:
+        raw_data = digimon_io.read_sheet_file(file_path)
+        character_data = prepare_sheet(raw_data)
+        stats = digimon_stats.compute_stats(character_data)
+    except Exception as e:
+        result["error"] = str(e) or type(e).__name__
+        return result
+
+    result["dp_spent"] = stats["dp_spent"]
+    result["dp_allocated"] = stats["dp_allocated"]
+    result["over_allocated"] = stats["dp_spent"] > stats["dp_allocated"]
+
+    # Migrated, filled in or coerced by the schema pre-pass
+    result["migrated"] = character_data != raw_data
+
+    if write:
+        changed = result["migrated"]
+        for field, stat in STORED_FIELDS.items():
+            if character_data.get(field) != stats[stat]:
+                character_data[field] = stats[stat]
+                changed = True
+        if changed:
+            try:
+                digimon_io.write_sheet_file(file_path, Character.from_dict(character_data).to_dict())
+                result["rewritten"] = True
+            except Exception as e:
+                result["error"] = f"could not write file: {str(e)}"
+
+    return result
+
+
+def _process_sheet_file_write(file_path):
+    return process_sheet_file(file_path, write=True)
+
+
+def run(file_paths, write=False, workers=None, out=sys.stdout, rules_path=None):
+    # Returns the process exit code: 0 if every sheet is fine, 1 otherwise
+    worker = _process_sheet_file_write if write else process_sheet_file
+    chunksize = max(1, len(file_paths) // ((workers or os.cpu_count() or 1) * 4))
+
+    # Compiled formulas don't pickle, so each worker loads the rules file itself
+    errors = over_allocated = rewritten = migrated = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=digimon_stats.use_rules,
+                             initargs=(rules_path,)) as executor:
+        for result in executor.map(worker, file_paths, chunksize=chunksize):
+            if result["error"]:
+                errors += 1
+                print(f"ERROR {result['file_path']}: {result['error']}", file=out)
+            if result["over_allocated"]:
+                over_allocated += 1
+                print(f"OVER  {result['file_path']}: {result['dp_spent']} DP spent "
+                      f"of {result['dp_allocated']} allocated", file=out)
+            if result["rewritten"]:
+                rewritten += 1
+            if result["migrated"]:
+                migrated += 1
+
+    summary = f"{len(file_paths)} sheets checked, {over_allocated} over-allocated, {errors} errors"
+    if write:
+        summary += f", {migrated} migrated, {rewritten} rewritten"
+    else:
+        summary += f", {migrated} need migrating (use --write)"
+    print(summary, file=out)
+    return 1 if errors or over_allocated else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Recompute and validate Digimon 2e character sheet files without the GUI."
+    )
+    parser.add_argument("paths", nargs="+", help="sheet files or folders of sheet files")
+    parser.add_argument("-r", "--recursive", action="store_true", help="also look in subfolders")
+    parser.add_argument("-w", "--write", action="store_true",
+                        help="rewrite the stored DP totals of sheets where they are out of date "
+                             "and migrate sheets to the current schema")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="number of worker processes (default: one per CPU)")
+    parser.add_argument("--rules", help="house rules file to calculate with (default: the standard rules)")
+    args = parser.parse_args(argv)
+
+    if args.rules:
+        try:
+            digimon_stats.load_rules(args.rules)
+        except Exception as e:
+            print(f"Could not load rules: {str(e)}", file=sys.stderr)
+            return 1
+
+    file_paths = collect_sheet_files(args.paths, args.recursive)
+    if not file_paths:
+        print("No character sheets found", file=sys.stderr)
+        return 1
+    return run(file_paths, write=args.write, workers=args.workers, rules_path=args.rules)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Debug panel with live performance counters.
+
+A small window (Help > Debug Panel, or F12) that refreshes twice a second
+with recalculation rate and latency, widget and tab counts, theme images,
+the last save and the process's memory use, so a sluggish session can be
+narrowed down to recalculation, layout or I/O.
+"""
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from digimon_metrics import metrics, process_rss
+
+ROWS = [
+    ("recalc_rate", "Recalculations/sec"),
+    ("recalc_avg", "Recalculate avg"),
+    ("recalc_p99", "Recalculate p99"),
+    ("widgets_current", "Widgets (current sheet)"),
+    ("widgets_all", "Widgets (all built sheets)"),
+    ("materialized", "Built tabs"),
+    ("images", "Tk images"),
+    ("last_save", "Last save"),
+    ("rss", "Process RSS"),
+    ("errors", "Errors"),
+]
+
+
+def count_widgets(widget):
+    # widget and everything inside it
+    count = 0
+    stack = [widget]
+    while stack:
+        current = stack.pop()
+        count += 1
+        stack.extend(current.winfo_children())
+    return count
+
+
+def format_ms(value):
+    return "-" if value is None else f"{value:.2f} ms"
+
+
+class DebugHud:
+    def __init__(self, app, refresh_ms=500):
+        self.app = app
+        self.refresh_ms = refresh_ms
+        self.window = None
+        self.job = None
+        self.values = {}
+        self._last_sample = None
+
+    def toggle(self):
+        if self.window is None:
+            self.show()
+        else:
+            self.close()
+
+    def show(self):
+        if self.window is not None:
+            self.window.lift()
+            return
+
+        self.window = tk.Toplevel(self.app.root)
+        self.window.title("Debug Panel")
+        self.window.resizable(False, False)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        for row, (key, label) in enumerate(ROWS):
+            ttk.Label(self.window, text=label + ":").grid(row=row, column=0, padx=(10, 5), pady=2, sticky="w")
+            self.values[key] = tk.StringVar(master=self.window, value="-")
+            ttk.Label(self.window, textvariable=self.values[key], width=24).grid(
+                row=row, column=1, padx=(5, 10), pady=2, sticky="w"
+            )
+
+        self._last_sample = None
+        self.refresh()
+
+    def close(self):
+        if self.job is not None:
+            self.window.after_cancel(self.job)
+            self.job = None
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
+        self.values = {}
+
+    def refresh(self):
+        self.job = None
+        for key, value in self.collect().items():
+            self.values[key].set(value)
+        self.job = self.window.after(self.refresh_ms, self.refresh)
+
+    def collect(self):
+        app = self.app
+        now = time.perf_counter()
+        recalculations = metrics.counters["recalculations"]
+        if self._last_sample is None:
+            rate = "-"
+        else:
+            last_time, last_count = self._last_sample
+            rate = f"{(recalculations - last_count) / (now - last_time):.1f}"
+        self._last_sample = (now, recalculations)
+
+        timing = metrics.timing_summary("recalculate")
+
+        built = [sheet for sheet in app.open_sheets if sheet.get("materialized", True)]
+        current = app.open_sheets.by_tab(app.notebook.select())
+        widgets = {sheet["id"]: count_widgets(sheet["frame"]) for sheet in built}
+        if current is not None and current["id"] in widgets:
+            widgets_current = str(widgets[current["id"]])
+        else:
+            widgets_current = "-"
+
+        last_save = metrics.last_times.get("save")
+        if last_save is None:
+            last_save_text = "never"
+        else:
+            last_save_text = f"{time.strftime('%H:%M:%S', time.localtime(last_save))} ({time.time() - last_save:.0f} s ago)"
+
+        rss = process_rss()
+
+        return {
+            "recalc_rate": rate,
+            "recalc_avg": format_ms(timing["avg_ms"]),
+            "recalc_p99": format_ms(timing["p99_ms"]),
+            "widgets_current": widgets_current,
+            "widgets_all": str(sum(widgets.values())),
+            "materialized": f"{len(built)} of {len(app.open_sheets)} open",
+            "images": f"{len(app.root.tk.splitlist(app.root.tk.call('image', 'names')))} "
+                      f"({app.theme_images.image_count()} cached theme)",
+            "last_save": last_save_text,
+            "rss": "n/a" if rss is None else f"{rss / (1024 * 1024):.1f} MB",
+            "errors": str(metrics.error_count()),
+        }
@@ -0,0 +1,215 @@
+"""Reading and writing character sheet files.
+
+Nothing in here touches tkinter, so these helpers can run on worker threads
+(e.g. when a whole campaign folder is opened) or outside the GUI entirely.
+
+The file extension picks the format a sheet is saved in: ".json" is the
+usual pretty-printed layout, ".min.json" the same JSON without whitespace,
+and ".json.gz" / ".json.xz" minified JSON compressed with gzip or lzma.
+All of them hold the same data and read back to the same dict; compressed
+files are recognized by their header, whatever they are named. Every
+format is UTF-8.
+
+Saving builds the sheet's whole JSON text first, because its digest
+decides whether anything needs writing; reading decompresses on the fly.
+
+A path of the form "<bundle>.digibundle::<member>" names one sheet inside a
+campaign bundle (see digimon_bundle); reading and writing it works like any
+other sheet file, with each save appended to the bundle as a new version.
+"""
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import os
+import tempfile
+from collections import namedtuple
+from concurrent.futures import wait
+
+from digimon_bundle import open_bundle, split_member_path
+from digimon_schema import prepare_sheet
+
+# compression: gzip, lzma or None; json_options: passed to json.JSONEncoder
+SheetFormat = namedtuple("SheetFormat", ["name", "suffix", "compression", "json_options"])
+
+PRETTY_JSON = {"indent": 4}
+COMPACT_JSON = {"separators": (",", ":")}
+
+# Longest suffix first, so ".min.json" is matched before ".json"
+SHEET_FORMATS = (
+    SheetFormat("gzip", ".json.gz", gzip, COMPACT_JSON),
+    SheetFormat("lzma", ".json.xz", lzma, COMPACT_JSON),
+    SheetFormat("minified", ".min.json", None, COMPACT_JSON),
+    SheetFormat("json", ".json", None, PRETTY_JSON),
+)
+DEFAULT_FORMAT = SHEET_FORMATS[-1]
+# Sheets inside campaign bundles are stored as minified JSON
+BUNDLE_FORMAT = SHEET_FORMATS[2]
+# Sheet fields kept in a bundle's index, so its members can be listed without reading them
+BUNDLE_INFO_FIELDS = ("digimon", "stage", "size")
+SHEET_EXTENSIONS = tuple(file_format.suffix for file_format in SHEET_FORMATS)
+
+# For the open/save dialogs
+SHEET_FILETYPES = [
+    ("Character Sheets", " ".join("*" + suffix for suffix in SHEET_EXTENSIONS)),
+    ("JSON Files", "*.json"),
+    ("Compressed Sheets", "*.json.gz *.json.xz"),
+    ("All Files", "*.*"),
+]
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_XZ_MAGIC = b"\xfd7zXZ\x00"
+# Text is encoded and handed to the compressors in pieces this big, so
+# the whole file never exists as bytes as well as text
+_WRITE_CHUNK = 64 * 1024
+# xz's default preset with a 1 MiB dictionary instead of 8 MiB: sheets are far
+# smaller than that, and setting up the big dictionary took longer than compressing
+_XZ_FILTERS = [{"id": lzma.FILTER_LZMA2, "preset": 6, "dict_size": 1 << 20}]
+
+# Read once at import (os.umask can only be queried by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def sheet_format(file_path):
+    # The SheetFormat a file is saved in, by extension (anything unknown is pretty JSON)
+    name = file_path.lower()
+    for file_format in SHEET_FORMATS:
+        if name.endswith(file_format.suffix):
+            return file_format
+    return DEFAULT_FORMAT
+
+
+def _compression_of(file):
+    # gzip, lzma or None from the first bytes of a binary file object
+    header = file.read(len(_XZ_MAGIC))
+    file.seek(0)
+    if header.startswith(_GZIP_MAGIC):
+        return gzip
+    if header.startswith(_XZ_MAGIC):
+        return lzma
+    return None
+
+
+def open_sheet_stream(file_path):
+    # Text stream over a sheet file, decompressing on the fly as it is read
+    raw = open(file_path, 'rb')
+    try:
+        compression = _compression_of(raw)
+    except BaseException:
+        raw.close()
+        raise
+    if compression is None:
+        raw.close()
+        return open(file_path, 'r', encoding="utf-8")
+    return io.TextIOWrapper(compression.open(raw), encoding="utf-8")
+
+
+def read_sheet_file(file_path):
+    # Loads one character sheet file (any format) into a plain dict
+    member = split_member_path(file_path)
+    if member:
+        bundle_path, name = member
+        return open_bundle(bundle_path).read(name)
+    with open_sheet_stream(file_path) as file:
+        return json.load(file)
+
+
+def load_sheet_file(file_path):
+    # read_sheet_file plus the schema pre-pass: returns a migrated, checked
+    # sheet dict or raises SheetSchemaError before any form is built from it
+    return prepare_sheet(read_sheet_file(file_path))
+
+
+def list_sheet_files(folder):
+    # Every sheet file directly inside folder, sorted by name
+    return sorted(
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if name.lower().endswith(SHEET_EXTENSIONS) and os.path.isfile(os.path.join(folder, name))
+    )
+
+
+def encode_sheet(character_data, file_format=DEFAULT_FORMAT):
+    # The JSON text of a sheet in file_format (before any compression)
+    return json.dumps(character_data, **file_format.json_options)
+
+
+def _compressed_writer(raw, compression):
+    # Text stream writing through gzip/lzma into the binary file raw.
+    # gzip gets a fixed mtime so the same sheet always compresses to the same bytes.
+    if compression is gzip:
+        stream = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6, mtime=0)
+    else:
+        stream = lzma.LZMAFile(raw, mode='wb', filters=_XZ_FILTERS)
+    return io.TextIOWrapper(stream, encoding="utf-8")
+
+
+def content_digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def write_text_atomic(file_path, text, compression=None):
+    # Writes to a temporary file next to the target and swaps it in with
+    # os.replace, so a crash mid-save never leaves a truncated file behind.
+    # compression: gzip or lzma to compress the text on the way out
+    folder = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix="." + os.path.basename(file_path) + ".", suffix=".tmp")
+    try:
+        if compression is None:
+            with os.fdopen(fd, 'w', encoding="utf-8") as file:
+                file.write(text)
+                file.flush()
+                os.fsync(file.fileno())
+        else:
+            with os.fdopen(fd, 'wb') as raw:
+                with _compressed_writer(raw, compression) as file:
+                    for start in range(0, len(text), _WRITE_CHUNK):
+                        file.write(text[start:start + _WRITE_CHUNK])
+                raw.flush()
+                os.fsync(raw.fileno())
+        # mkstemp creates the file owner-only; keep the permissions a plain open() would give
+        try:
+            mode = os.stat(file_path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_sheet_file(file_path, character_data, previous_digest=None):
+    # Saves a plain character dict atomically, in the format its extension
+    # picks, and returns the content digest (of the JSON text, so it doesn't
+    # depend on compression). If it matches previous_digest nothing is written.
+    member = split_member_path(file_path)
+    file_format = BUNDLE_FORMAT if member else sheet_format(file_path)
+    text = encode_sheet(character_data, file_format)
+    digest = content_digest(text)
+    if digest != previous_digest:
+        if member:
+            write_bundle_member(member, text, character_data)
+        else:
+            write_text_atomic(file_path, text, file_format.compression)
+    return digest
+
+
+def write_bundle_member(member, text, character_data):
+    # Appends a new version of a bundle member, with what the bundle
+    # window lists stored in the index
+    bundle_path, name = member
+    info = {field: character_data.get(field, "") for field in BUNDLE_INFO_FIELDS}
+    open_bundle(bundle_path).append(name, text.encode("utf-8"), info)
+
+
+def write_sheet_file_after(previous_future, file_path, character_data, previous_digest=None):
+    # write_sheet_file for worker pools: waits for an earlier save of the
+    # same sheet first, so an older snapshot can never land on top of this one
+    if previous_future is not None:
+        wait([previous_future])
+    return write_sheet_file(file_path, character_data, previous_digest)
@@ -0,0 +1,97 @@
+"""Per-sheet ownership of Tk resources that outlive the sheet's widgets.
+
+Destroying a sheet's frame cleans up its widgets and their own bindings, but
+not variable traces, bindings on the "all" tag or pending after() jobs: Tcl
+keeps those callbacks (and everything their closures reference) alive. Each
+materialized sheet registers them through a SheetLifecycle, and close()
+releases them all when the sheet is closed or hibernated.
+"""
+import tkinter as tk
+
+
+class SheetLifecycle:
+    def __init__(self, widget):
+        # widget: any widget of the sheet, used for after() and bind_all()
+        self.widget = widget
+        self._traces = []
+        self._global_bindings = []
+        self._jobs = set()
+        self._cleanups = []
+        self.closed = False
+
+    def trace(self, var, callback, mode="write"):
+        name = var.trace_add(mode, callback)
+        self._traces.append((var, mode, name))
+        return name
+
+    def bind_all(self, sequence, callback):
+        # Adds to the "all" bindings instead of replacing the ones other sheets made
+        funcid = self.widget.bind_all(sequence, callback, add="+")
+        self._global_bindings.append((sequence, funcid))
+        return funcid
+
+    # after()/after_idle()/after_cancel() match the widget methods, so a
+    # lifecycle can stand in for the widget (e.g. for a RecalcScheduler)
+    def after(self, ms, callback, *args):
+        def run():
+            self._jobs.discard(job)
+            callback(*args)
+        job = self.widget.after(ms, run)
+        self._jobs.add(job)
+        return job
+
+    def after_idle(self, callback, *args):
+        def run():
+            self._jobs.discard(job)
+            callback(*args)
+        job = self.widget.after_idle(run)
+        self._jobs.add(job)
+        return job
+
+    def after_cancel(self, job):
+        self._jobs.discard(job)
+        self.widget.after_cancel(job)
+
+    def on_close(self, callback):
+        # Extra cleanup to run when the sheet is closed
+        self._cleanups.append(callback)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+
+        for callback in self._cleanups:
+            callback()
+
+        for job in self._jobs:
+            try:
+                self.widget.after_cancel(job)
+            except tk.TclError:
+                pass
+
+        for var, mode, name in self._traces:
+            try:
+                var.trace_remove(mode, name)
+            except tk.TclError:
+                pass
+
+        for sequence, funcid in self._global_bindings:
+            self._unbind_all(sequence, funcid)
+
+        self._jobs.clear()
+        self._traces.clear()
+        self._global_bindings.clear()
+        self._cleanups.clear()
+
+    def _unbind_all(self, sequence, funcid):
+        # unbind_all() would drop every sheet's handler for the sequence, so
+        # only this sheet's line is cut out of the "all" binding script
+        tk_app = self.widget.tk
+        try:
+            script = tk_app.call("bind", "all", sequence)
+            lines = [line for line in script.split("\n") if funcid not in line]
+            tk_app.call("bind", "all", sequence, "\n".join(lines))
+            self.widget._root().deletecommand(funcid)
+        except tk.TclError:
+            pass
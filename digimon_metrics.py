@@ -0,0 +1,167 @@
+"""Logging and usage counters for the app.
+
+Everything logs through the "digimon" logger, which has no output unless
+the DIGIMON_LOG environment variable names a level (e.g. DIGIMON_LOG=debug),
+so the windowed build never formats messages nobody will see. Hot paths
+check log.isEnabledFor() before building a message at all.
+
+The shared `metrics` object counts recalculations, forms and rows built,
+loads and saves, tallies errors by where they happened and which field
+caused them, and keeps recent timings for averages and percentiles.
+snapshot() returns the lot as a plain dict.
+
+    DIGIMON_LOG=debug python digimon_2e_latest_version.py
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+log = logging.getLogger("digimon")
+log.addHandler(logging.NullHandler())
+# Off until configure_logging() picks a level
+log.setLevel(logging.CRITICAL + 1)
+
+# Recent durations kept per timing name
+TIMING_SAMPLES = 1000
+
+
+def configure_logging(level=None):
+    # level: a logging level name; defaults to $DIGIMON_LOG, off if unset
+    level = level or os.environ.get("DIGIMON_LOG")
+    # The --noconsole build has no stderr to log to
+    if not level or sys.stderr is None:
+        return
+    # A mistyped level must not stop the app from starting
+    if not isinstance(logging.getLevelName(level.upper()), int):
+        print(f"Unknown log level {level!r}, logging warnings instead", file=sys.stderr)
+        level = "WARNING"
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    log.addHandler(handler)
+    log.setLevel(level.upper())
+
+
+class Metrics:
+    def __init__(self):
+        self.started = time.time()
+        self.counters = Counter()
+        # (where, field) -> number of errors, and the latest message for each
+        self.errors = Counter()
+        self.last_errors = {}
+        # name -> recent durations in milliseconds
+        self.timings = {}
+        # name -> time.time() of the latest event
+        self.last_times = {}
+        # Saves finish on I/O threads
+        self._lock = threading.Lock()
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def error(self, where, field, exc):
+        key = (where, field or "")
+        with self._lock:
+            self.errors[key] += 1
+            self.last_errors[key] = str(exc) or type(exc).__name__
+        log.warning("%s failed on %s: %s", where, field or "?", exc)
+
+    def error_count(self):
+        with self._lock:
+            return sum(self.errors.values())
+
+    def observe(self, name, ms):
+        with self._lock:
+            samples = self.timings.get(name)
+            if samples is None:
+                samples = self.timings[name] = deque(maxlen=TIMING_SAMPLES)
+            samples.append(ms)
+
+    def touch(self, name):
+        self.last_times[name] = time.time()
+
+    def timing_summary(self, name):
+        # Average and 99th percentile of the recent samples, in milliseconds
+        with self._lock:
+            samples = sorted(self.timings.get(name, ()))
+        if not samples:
+            return {"samples": 0, "avg_ms": None, "p99_ms": None}
+        return {
+            "samples": len(samples),
+            "avg_ms": sum(samples) / len(samples),
+            "p99_ms": samples[int(0.99 * (len(samples) - 1))],
+        }
+
+    def snapshot(self):
+        timings = {name: self.timing_summary(name) for name in list(self.timings)}
+        with self._lock:
+            return {
+                "time": time.time(),
+                "uptime": time.time() - self.started,
+                "counters": dict(self.counters),
+                "timings": timings,
+                "last_times": dict(self.last_times),
+                "rss_bytes": process_rss(),
+                "errors": [
+                    {"where": where, "field": field, "count": count,
+                     "last_error": self.last_errors[(where, field)]}
+                    for (where, field), count in self.errors.most_common()
+                ],
+            }
+
+    def export(self, file_path):
+        with open(file_path, 'w') as file:
+            json.dump(self.snapshot(), file, indent=4)
+
+
+def process_rss():
+    # Resident memory of this process in bytes, or None if it can't be read
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if sys.platform == "win32":
+        return _windows_rss()
+    return None
+
+
+def _windows_rss():
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    get_process = ctypes.windll.kernel32.GetCurrentProcess
+    get_process.restype = wintypes.HANDLE
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(get_process(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.WorkingSetSize
+
+
+metrics = Metrics()
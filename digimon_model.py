@@ -0,0 +1,160 @@
+"""Plain character model for Digimon 2e sheets.
+
+Character, Attack and Effect hold only sheet values (no Tk objects), so they
+are cheap to keep for every open tab, can be pickled and are safe to use
+from worker threads and processes. The widgets that edit a character are
+tracked separately, in the view dict built by the form.
+"""
+
+# Sheet file format version (see digimon_schema for the migrations)
+SCHEMA_VERSION = 1
+
+# Top-level keys of a saved character sheet, in file order
+SHEET_FIELDS = [
+    "name", "digimon", "stage", "size", "attribute", "type",
+    "wound_boxes", "temp_boxes", "battery",
+    "stats", "derived_stats", "misc_stats", "qualities", "attacks", "effects",
+    "bonus_dp_var", "quality_spent_var", "stat_spent_var", "dp_spent_var", "dp_allocated_var"
+]
+
+
+class Attack:
+    __slots__ = ("name", "accuracy", "type", "damage", "tags")
+
+    def __init__(self, name="", accuracy=0, type="Melee", damage=0, tags=None):
+        self.name = name
+        self.accuracy = accuracy
+        self.type = type
+        self.damage = damage
+        self.tags = list(tags) if tags is not None else ["", "", ""]
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            name=data.get("name", ""),
+            accuracy=data.get("accuracy", 0),
+            type=data.get("type", "Melee"),
+            damage=data.get("damage", 0),
+            tags=data.get("tags", ["", "", ""])
+        )
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "accuracy": self.accuracy,
+            "type": self.type,
+            "damage": self.damage,
+            "tags": list(self.tags)
+        }
+
+    def __eq__(self, other):
+        return isinstance(other, Attack) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"Attack({self.name!r})"
+
+
+class Effect:
+    __slots__ = ("eff_name", "potency", "duration")
+
+    def __init__(self, eff_name="", potency=0, duration=0):
+        self.eff_name = eff_name
+        self.potency = potency
+        self.duration = duration
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            eff_name=data.get("eff_name", ""),
+            potency=data.get("potency", 0),
+            duration=data.get("duration", 0)
+        )
+
+    def to_dict(self):
+        return {
+            "eff_name": self.eff_name,
+            "potency": self.potency,
+            "duration": self.duration,
+        }
+
+    def __eq__(self, other):
+        return isinstance(other, Effect) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"Effect({self.eff_name!r})"
+
+
+class Character:
+    # Attribute names match the sheet file keys; "extra" keeps any keys
+    # this version of the app doesn't know about so they survive a save
+    __slots__ = tuple(SHEET_FIELDS) + ("extra",)
+
+    DEFAULTS = {
+        "name": "",
+        "digimon": "",
+        "stage": "Child",
+        "size": "Medium",
+        "attribute": "Vaccine",
+        "type": "",
+        "wound_boxes": 0,
+        "temp_boxes": 0,
+        "battery": 0,
+        "qualities": "",
+        "bonus_dp_var": 0,
+        "quality_spent_var": 0,
+        "stat_spent_var": 0,
+        "dp_spent_var": 0,
+        "dp_allocated_var": 0,
+    }
+
+    def __init__(self, **values):
+        for field, default in self.DEFAULTS.items():
+            setattr(self, field, values.pop(field, default))
+        self.stats = dict(values.pop("stats", {}))
+        self.derived_stats = dict(values.pop("derived_stats", {}))
+        self.misc_stats = dict(values.pop("misc_stats", {}))
+        self.attacks = list(values.pop("attacks", []))
+        self.effects = list(values.pop("effects", []))
+        self.extra = dict(values.pop("extra", {}))
+        if values:
+            raise TypeError(f"Unknown character fields: {', '.join(values)}")
+
+    @classmethod
+    def from_dict(cls, data):
+        # Builds a character from a sheet dict (as loaded from a file)
+        if isinstance(data, Character):
+            return data
+
+        values = {field: data[field] for field in cls.DEFAULTS if field in data}
+        for field in ("stats", "derived_stats", "misc_stats"):
+            values[field] = data.get(field) or {}
+
+        # Older sheets may hold a single effect instead of a list
+        effects = data.get("effects", [])
+        if not isinstance(effects, list):
+            effects = [effects] if effects else []
+        values["effects"] = [Effect.from_dict(effect) for effect in effects]
+        values["attacks"] = [Attack.from_dict(attack) for attack in data.get("attacks", [])]
+
+        values["extra"] = {key: value for key, value in data.items()
+                           if key not in SHEET_FIELDS and key != "schema_version" and not key.startswith("_")}
+        return cls(**values)
+
+    def to_dict(self):
+        # The sheet file layout
+        data = {"schema_version": SCHEMA_VERSION}
+        for field in SHEET_FIELDS:
+            value = getattr(self, field)
+            if field in ("attacks", "effects"):
+                value = [item.to_dict() for item in value]
+            elif isinstance(value, dict):
+                value = dict(value)
+            data[field] = value
+        data.update(self.extra)
+        return data
+
+    def __eq__(self, other):
+        return isinstance(other, Character) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"Character({self.name!r}, {self.digimon!r})"
@@ -0,0 +1,19 @@
+"""Locating the data files that ship with the app.
+
+Kept free of tkinter, so the stat engine and the batch CLI can find their
+data files the same way the GUI finds its artwork.
+"""
+import os
+import sys
+
+
+def resource_path(relative_path):
+    """ Get absolute path to resource, works for dev and for PyInstaller """
+    try:
+        # PyInstaller creates a temp folder and stores path in _MEIPASS
+        base_path = sys._MEIPASS
+    except Exception:
+        # Running from source: the data files sit next to the modules
+        base_path = os.path.dirname(os.path.abspath(__file__))
+
+    return os.path.join(base_path, relative_path)
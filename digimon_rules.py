@@ -0,0 +1,62 @@
+"""Stage and size rules tables for Digimon 2e.
+
+Everything a Digimon's stage or size contributes to its sheet is worked out
+once at import and stored in read-only tables, so the stat engine looks a
+stage or size up with a single dict access instead of recomputing it.
+Every stage and size the form offers has an entry; anything else falls back
+to UNKNOWN_STAGE / UNKNOWN_SIZE.
+"""
+from collections import namedtuple
+from types import MappingProxyType
+
+STAGES = ("Baby", "Child", "Adult", "Perfect", "Ultimate")
+SIZES = ("Small", "Medium", "Large", "Huge", "Gigantic", "Colossal")
+
+STAGE_VALUES = MappingProxyType({name: value for value, name in enumerate(STAGES, 1)})
+SIZE_VALUES = MappingProxyType({name: value for value, name in enumerate(SIZES, 1)})
+
+# value: added to every primary stat
+# health, battery, movement, range: added to max health, max battery, movement and max range
+# dp_budget: DP allocated before bonus DP
+StageRules = namedtuple("StageRules", ["value", "health", "battery", "movement", "range", "dp_budget"])
+
+# Bonuses to the derived stats, in BIT, DOS, RAM, CPU order
+SizeRules = namedtuple("SizeRules", ["bit", "dos", "ram", "cpu"])
+
+
+def _stage_rules(value, dp_value):
+    return StageRules(
+        value=value,
+        health=value - 1,
+        battery=value - 1,
+        movement=value + 1,
+        range=value - 1,
+        dp_budget=(dp_value - 1) * 10,
+    )
+
+
+STAGE_RULES = MappingProxyType({name: _stage_rules(value, value) for name, value in STAGE_VALUES.items()})
+# An unknown stage counts as Baby for stats but as Child for the DP budget
+UNKNOWN_STAGE = _stage_rules(1, 2)
+
+SIZE_RULES = MappingProxyType({
+    "Small": SizeRules(1, 0, 2, 0),
+    "Medium": SizeRules(1, 0, 1, 0),
+    "Large": SizeRules(1, 0, 0, 1),
+    "Huge": SizeRules(0, 1, 0, 1),
+    "Gigantic": SizeRules(0, 1, 0, 2),
+    "Colossal": SizeRules(0, 1, 0, 2),
+})
+UNKNOWN_SIZE = SIZE_RULES["Medium"]
+
+# The same rules indexed by stage/size value, with the unknown entry at 0
+STAGE_TABLE = (UNKNOWN_STAGE,) + tuple(STAGE_RULES[name] for name in STAGES)
+SIZE_TABLE = (UNKNOWN_SIZE,) + tuple(SIZE_RULES[name] for name in SIZES)
+
+
+def stage_rules(stage):
+    return STAGE_RULES.get(stage, UNKNOWN_STAGE)
+
+
+def size_rules(size):
+    return SIZE_RULES.get(size, UNKNOWN_SIZE)
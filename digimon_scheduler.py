@@ -0,0 +1,49 @@
+"""Coalesced recalculation for character sheets.
+
+Form traces mark fields dirty instead of recalculating straight away; the
+scheduler runs one recalculation for everything marked since the last run,
+on the next idle cycle of the Tk loop (or after a short coalescing window).
+"""
+
+
+class RecalcScheduler:
+    def __init__(self, widget, callback, delay_ms=0):
+        # widget: any Tk widget, used for after()/after_idle()
+        # callback: called with the set of dirty field names
+        # delay_ms: coalescing window, 0 means "next idle cycle"
+        self.widget = widget
+        self.callback = callback
+        self.delay_ms = delay_ms
+        self.dirty = set()
+        self.job = None
+        self.runs = 0
+
+    def mark_dirty(self, *keys):
+        self.dirty.update(keys)
+        if self.job is None and self.dirty:
+            if self.delay_ms > 0:
+                self.job = self.widget.after(self.delay_ms, self._run)
+            else:
+                self.job = self.widget.after_idle(self._run)
+
+    def flush(self):
+        # Run any pending recalculation right now (e.g. before saving)
+        self.cancel()
+        self._run()
+
+    def cancel(self):
+        if self.job is not None:
+            try:
+                self.widget.after_cancel(self.job)
+            except Exception:
+                pass
+            self.job = None
+
+    def _run(self):
+        self.job = None
+        if not self.dirty:
+            return
+        keys = self.dirty
+        self.dirty = set()
+        self.runs += 1
+        self.callback(keys)
@@ -0,0 +1,198 @@
+"""Sheet file schema, validation and migrations.
+
+Every sheet file is run through prepare_sheet() before anything is built
+from it: files from older versions of the app are migrated step by step to
+SCHEMA_VERSION, missing keys are filled in, numbers saved as strings are
+turned back into numbers, and the result is checked against the schema.
+A file that still doesn't fit raises SheetSchemaError listing every
+problem, instead of crashing the form halfway through building.
+
+The normalizer and validator are compiled from SHEET_SCHEMA once, at
+import, into nested closures, so checking a sheet is a single pass over
+its data.
+"""
+import copy
+
+from digimon_model import SCHEMA_VERSION, Attack, Character, Effect
+from digimon_stats import DERIVED_KEYS, MISC_KEYS, STAT_KEYS
+
+
+class SheetSchemaError(ValueError):
+    def __init__(self, problems):
+        self.problems = list(problems)
+        shown = self.problems[:5]
+        if len(self.problems) > len(shown):
+            shown.append(f"...and {len(self.problems) - len(shown)} more")
+        super().__init__("; ".join(shown))
+
+
+# Schema: int/str for values, a dict of key -> schema for objects and a
+# one-item list for lists of that item
+ATTACK_SCHEMA = {"name": str, "accuracy": int, "type": str, "damage": int, "tags": [str]}
+EFFECT_SCHEMA = {"eff_name": str, "potency": int, "duration": int}
+SHEET_SCHEMA = {
+    "name": str, "digimon": str, "stage": str, "size": str, "attribute": str, "type": str,
+    "wound_boxes": int, "temp_boxes": int, "battery": int,
+    "stats": {f"{stat}_{kind}": int for stat in STAT_KEYS for kind in ("dp", "bonus")},
+    "derived_stats": {f"{stat}_bonus": int for stat in DERIVED_KEYS},
+    "misc_stats": {f"{stat}_bonus": int for stat in MISC_KEYS},
+    "qualities": str,
+    "attacks": [ATTACK_SCHEMA],
+    "effects": [EFFECT_SCHEMA],
+    "bonus_dp_var": int, "quality_spent_var": int, "stat_spent_var": int,
+    "dp_spent_var": int, "dp_allocated_var": int,
+}
+
+# Values filled in for missing keys (anything else gets 0, "", [] or {})
+SHEET_DEFAULTS = dict(Character.DEFAULTS)
+ITEM_DEFAULTS = {"attacks": Attack().to_dict(), "effects": Effect().to_dict()}
+
+
+def _normalize_int(value):
+    # Numbers saved as text become numbers again; anything else is left
+    # for the validator to report
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return 0
+        try:
+            return int(text)
+        except ValueError:
+            try:
+                number = float(text)
+            except ValueError:
+                return value
+            return int(number) if number.is_integer() else value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if value is None:
+        return 0
+    return value
+
+
+def _normalize_str(value):
+    return "" if value is None else value
+
+
+def _check_int(value, path, problems):
+    if not isinstance(value, int) or isinstance(value, bool):
+        problems.append(f"{path}: expected a whole number, got {value!r}")
+
+
+def _check_str(value, path, problems):
+    if not isinstance(value, str):
+        problems.append(f"{path}: expected text, got {value!r}")
+
+
+def _compile(schema, defaults=None):
+    # Returns (normalize(value) -> value, check(value, path, problems)).
+    # defaults: values for missing keys of an object, or of each object in a list
+    if schema is int:
+        return _normalize_int, _check_int
+    if schema is str:
+        return _normalize_str, _check_str
+
+    if isinstance(schema, list):
+        normalize_item, check_item = _compile(schema[0], defaults)
+
+        def normalize_list(value):
+            if value is None:
+                return []
+            # Older sheets may hold a single entry instead of a list
+            if isinstance(value, dict):
+                value = [value]
+            if not isinstance(value, list):
+                return value
+            return [normalize_item(item) for item in value]
+
+        def check_list(value, path, problems):
+            if not isinstance(value, list):
+                problems.append(f"{path}: expected a list, got {value!r}")
+                return
+            for index, item in enumerate(value):
+                check_item(item, f"{path}[{index}]", problems)
+
+        return normalize_list, check_list
+
+    defaults = defaults or {}
+    fields = [(key, _compile(field_schema, ITEM_DEFAULTS.get(key)), key in defaults, defaults.get(key))
+              for key, field_schema in schema.items()]
+
+    def normalize_dict(value):
+        if value is None:
+            value = {}
+        if not isinstance(value, dict):
+            return value
+        result = dict(value)
+        for key, (normalize, _), has_default, default in fields:
+            if key in result:
+                result[key] = normalize(result[key])
+            elif has_default:
+                result[key] = copy.deepcopy(default)
+            else:
+                result[key] = normalize(None)
+        return result
+
+    def check_dict(value, path, problems):
+        if not isinstance(value, dict):
+            problems.append(f"{path}: expected an object, got {value!r}")
+            return
+        for key, (_, check), _, _ in fields:
+            check(value.get(key), f"{path}.{key}" if path else key, problems)
+
+    return normalize_dict, check_dict
+
+
+normalize_sheet, _check_sheet = _compile(SHEET_SCHEMA, SHEET_DEFAULTS)
+
+
+def validate_sheet(data):
+    # Every way data doesn't fit the schema, as readable strings
+    problems = []
+    _check_sheet(data, "", problems)
+    return problems
+
+
+def _migrate_0(data):
+    # Sheets saved before schema_version existed: drop leftovers of the
+    # form's old in-place widget references
+    return {key: value for key, value in data.items() if not key.startswith("_")}
+
+
+# Version -> function turning a sheet of that version into the next one.
+# Files without a schema_version are version 0.
+MIGRATIONS = {
+    0: _migrate_0,
+}
+# Keys at least one of which a sheet without schema_version has to have
+VERSION_0_KEYS = ("stats",)
+
+
+def migrate_sheet(data):
+    version = data.get("schema_version", 0)
+    if not isinstance(version, int) or isinstance(version, bool) or version < 0:
+        raise SheetSchemaError([f"schema_version: expected a whole number, got {version!r}"])
+    if version > SCHEMA_VERSION:
+        raise SheetSchemaError([f"saved by a newer version of the app (schema {version}, "
+                                f"this version reads up to {SCHEMA_VERSION})"])
+    while version < SCHEMA_VERSION:
+        data = MIGRATIONS[version](data)
+        version += 1
+    data["schema_version"] = version
+    return data
+
+
+def prepare_sheet(data):
+    # The load pre-pass: migrate, fill in and coerce, then validate.
+    # Returns a sheet dict at SCHEMA_VERSION or raises SheetSchemaError.
+    if not isinstance(data, dict):
+        raise SheetSchemaError([f"expected a character sheet object, got {type(data).__name__}"])
+    # Every sheet the app has ever saved has its stats; without them (or a
+    # schema_version) any other JSON object would pass as a blank sheet
+    if "schema_version" not in data and not any(key in data for key in VERSION_0_KEYS):
+        raise SheetSchemaError(["not a character sheet (no schema_version or stats)"])
+    data = normalize_sheet(migrate_sheet(dict(data)))
+    problems = validate_sheet(data)
+    if problems:
+        raise SheetSchemaError(problems)
+    return data
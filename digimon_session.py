@@ -0,0 +1,89 @@
+"""Registry of the character sheets open in the app.
+
+Each open sheet gets a stable id and is indexed by its tab's widget path and
+by its file path, so finding the sheet for a tab, a widget inside a form or
+a file on disk is a dict lookup instead of a scan over every open sheet.
+Iterating the registry yields sheets in the order they were opened.
+"""
+import os
+
+from digimon_bundle import MEMBER_SEPARATOR, bundle_key, split_member_path
+
+
+def path_key(file_path):
+    # Spellings of the same file map to the same key; a bundle member is
+    # keyed by its bundle's key and its name
+    member = split_member_path(file_path)
+    if member:
+        bundle_path, name = member
+        return bundle_key(bundle_path) + MEMBER_SEPARATOR + name
+    return os.path.normcase(os.path.realpath(file_path))
+
+
+class SheetRegistry:
+    def __init__(self):
+        self._by_id = {}
+        self._by_tab = {}
+        self._by_path = {}
+        self._next_id = 1
+        # Number of "." separated parts in a tab path (all tabs share a parent)
+        self._tab_depth = None
+
+    def add(self, sheet_info):
+        sheet_info["id"] = self._next_id
+        self._next_id += 1
+        self._by_id[sheet_info["id"]] = sheet_info
+
+        tab_path = str(sheet_info["frame"])
+        self._by_tab[tab_path] = sheet_info
+        if self._tab_depth is None:
+            self._tab_depth = tab_path.count(".")
+
+        if sheet_info.get("file_path"):
+            self._by_path[path_key(sheet_info["file_path"])] = sheet_info
+        return sheet_info
+
+    def remove(self, sheet_info):
+        self._by_id.pop(sheet_info["id"], None)
+        self._by_tab.pop(str(sheet_info["frame"]), None)
+        if sheet_info.get("file_path"):
+            key = path_key(sheet_info["file_path"])
+            if self._by_path.get(key) is sheet_info:
+                del self._by_path[key]
+
+    def set_file_path(self, sheet_info, file_path):
+        # Re-indexes a sheet under a new file (e.g. after Save As)
+        if sheet_info.get("file_path"):
+            key = path_key(sheet_info["file_path"])
+            if self._by_path.get(key) is sheet_info:
+                del self._by_path[key]
+        sheet_info["file_path"] = file_path
+        self._by_path[path_key(file_path)] = sheet_info
+
+    def by_id(self, sheet_id):
+        return self._by_id.get(sheet_id)
+
+    def by_tab(self, tab_path):
+        # tab_path: a tab as returned by notebook.select() / notebook.tabs()
+        return self._by_tab.get(str(tab_path))
+
+    def by_path(self, file_path):
+        return self._by_path.get(path_key(file_path))
+
+    def by_widget(self, widget):
+        # The sheet whose tab contains widget (widget paths are nested)
+        if self._tab_depth is None:
+            return None
+        parts = str(widget).split(".")
+        if len(parts) <= self._tab_depth:
+            return None
+        return self._by_tab.get(".".join(parts[:self._tab_depth + 1]))
+
+    def __iter__(self):
+        return iter(list(self._by_id.values()))
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, sheet_info):
+        return self._by_id.get(sheet_info.get("id")) is sheet_info
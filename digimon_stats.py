@@ -0,0 +1,426 @@
+"""Headless stat engine for Digimon 2e character sheets.
+
+Works on the plain character dict that new_sheet builds (and that sheet
+files store), so stats can be recomputed without a Tk root. The GUI's
+calculate_stats feeds its widget values through the same functions.
+
+The formulas themselves live in a rules file (standard_rules.json, or a
+house rule set loaded with use_rules()) and are compiled into plain Python
+functions once, when the file is loaded. Stage and size contributions come
+from the tables in digimon_rules.
+
+calculate_batch() is the column-wise version for recomputing whole
+campaigns at once; it needs NumPy, the rest of the module does not.
+"""
+import ast
+import functools
+import json
+import math
+import os
+
+from digimon_resources import resource_path
+from digimon_rules import (SIZE_TABLE, SIZE_VALUES, SIZES, STAGE_TABLE, STAGE_VALUES, STAGES,
+                           SizeRules, StageRules, size_rules, stage_rules)
+
+# NumPy and the rules tables as arrays, loaded by _load_numpy() on the
+# first calculate_batch() call
+np = None
+_STAGE_ARRAYS = None
+_SIZE_ARRAY = None
+
+STAT_KEYS = ["acc", "dam", "dod", "arm", "hp"]
+DERIVED_KEYS = ["bit", "dos", "ram", "cpu"]
+MISC_KEYS = ["move", "init", "range", "max_range"]
+
+
+def to_int(value):
+    # Same conversion the form uses: empty entries count as 0
+    return int(value or 0)
+
+
+def character_inputs(character):
+    # Flattens a character dict into the raw inputs calculate() expects
+    stats = character.get("stats", {})
+    derived_stats = character.get("derived_stats", {})
+    misc_stats = character.get("misc_stats", {})
+
+    inputs = {
+        "stage": character.get("stage", "Child"),
+        "size": character.get("size", "Medium"),
+        "quality_spent": character.get("quality_spent_var", 0),
+        "bonus_dp": character.get("bonus_dp_var", 0),
+    }
+    for stat in STAT_KEYS:
+        inputs[f"{stat}_dp"] = stats.get(f"{stat}_dp", 0)
+        inputs[f"{stat}_bonus"] = stats.get(f"{stat}_bonus", 0)
+    for stat in DERIVED_KEYS:
+        inputs[f"{stat}_bonus"] = derived_stats.get(f"{stat}_bonus", 0)
+    for stat in MISC_KEYS:
+        inputs[f"{stat}_bonus"] = misc_stats.get(f"{stat}_bonus", 0)
+    return inputs
+
+
+# Calculated fields the sheet shows; every rule set has to define these
+OUTPUT_KEYS = (STAT_KEYS + DERIVED_KEYS + ["max_health", "max_batt"] + MISC_KEYS
+               + ["stat_spent", "dp_spent", "dp_allocated"])
+OUTPUT_SET = frozenset(OUTPUT_KEYS)
+# Raw fields formulas can read
+KNOWN_INPUTS = frozenset(character_inputs({}))
+
+STANDARD_RULES_PATH = resource_path("standard_rules.json")
+
+# Table lookups the formulas build on (see digimon_rules)
+TABLE_NODES = {
+    "stage_rules": (("stage",), stage_rules),
+    "size_rules": (("size",), size_rules),
+}
+TABLE_FIELDS = {"stage_rules": StageRules._fields, "size_rules": SizeRules._fields}
+
+# Everything a formula can call
+FORMULA_FUNCTIONS = {
+    "int": to_int,
+    "max": max,
+    "min": min,
+    "abs": abs,
+    "round": round,
+    "floor": math.floor,
+    "ceil": math.ceil,
+}
+
+_FORMULA_SYNTAX = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+    ast.Call, ast.Name, ast.Attribute, ast.Constant, ast.Load,
+    ast.operator, ast.unaryop, ast.boolop, ast.cmpop,
+)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_formula(expression):
+    # Turns a formula into (fields it reads, function taking those fields in
+    # order). The function is a plain lambda, so evaluating it costs the same
+    # as a hand-written one. Raises ValueError for anything but arithmetic.
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"invalid formula {expression!r}: {e.msg}") from None
+
+    deps = []
+    for node in ast.walk(tree):
+        if not isinstance(node, _FORMULA_SYNTAX):
+            raise ValueError(f"{type(node).__name__} is not allowed in formula {expression!r}")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FORMULA_FUNCTIONS or node.keywords:
+                raise ValueError(f"unknown function in formula {expression!r}")
+        elif isinstance(node, ast.Attribute):
+            if not isinstance(node.value, ast.Name) or node.attr not in TABLE_FIELDS.get(node.value.id, ()):
+                raise ValueError(f"unknown table field in formula {expression!r}")
+        elif isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float, str)):
+                raise ValueError(f"unsupported constant in formula {expression!r}")
+        elif isinstance(node, ast.Name):
+            if node.id.startswith("_"):
+                raise ValueError(f"unknown field {node.id!r} in formula {expression!r}")
+            if node.id not in FORMULA_FUNCTIONS and node.id not in deps:
+                deps.append(node.id)
+
+    source = f"lambda {', '.join(deps)}: ({expression.strip()})"
+    formula = eval(compile(source, f"<formula {expression}>", "eval"), {"__builtins__": {}, **FORMULA_FUNCTIONS})
+    return tuple(deps), formula
+
+
+def _topological_order(nodes):
+    order = []
+    visited = set()
+    visiting = set()
+
+    def visit(name):
+        if name in visited or name not in nodes:
+            return
+        if name in visiting:
+            raise ValueError(f"formulas depend on each other in a loop through {name!r}")
+        visiting.add(name)
+        for dep in nodes[name][0]:
+            visit(dep)
+        visiting.discard(name)
+        visited.add(name)
+        order.append(name)
+
+    for name in nodes:
+        visit(name)
+    return order
+
+
+class RuleSet:
+    """A compiled set of formulas.
+
+    nodes maps each calculated field to (fields it reads, function), and
+    the evaluation order and the fields downstream of each input are
+    worked out once here rather than on every recalculation.
+    """
+
+    def __init__(self, formulas, name=""):
+        self.name = name
+        self.formulas = dict(formulas)
+        missing = [key for key in OUTPUT_KEYS if key not in self.formulas]
+        if missing:
+            raise ValueError(f"rules have no formula for {', '.join(missing)}")
+
+        nodes = dict(TABLE_NODES)
+        for node, expression in self.formulas.items():
+            if (not node.isidentifier() or node.startswith("_") or node in TABLE_NODES
+                    or node in KNOWN_INPUTS or node in FORMULA_FUNCTIONS):
+                raise ValueError(f"{node!r} can't be used as a formula name")
+            try:
+                nodes[node] = compile_formula(expression)
+            except ValueError as e:
+                raise ValueError(f"{node}: {e}") from None
+
+        unknown = sorted({dep for deps, _ in nodes.values() for dep in deps
+                          if dep not in nodes and dep not in KNOWN_INPUTS})
+        if unknown:
+            raise ValueError(f"rules read unknown field(s) {', '.join(unknown)}")
+
+        # Field -> (fields it reads, formula taking those fields in order)
+        self.nodes = nodes
+        self.node_order = _topological_order(nodes)
+        self.input_keys = sorted({dep for deps, _ in nodes.values() for dep in deps if dep not in nodes})
+        # Input field -> nodes to re-evaluate when it changes
+        self.downstream = {name: self.downstream_of([name]) for name in self.input_keys}
+
+    def downstream_of(self, names):
+        # Every node that (transitively) reads one of names, in evaluation order
+        affected = set(names)
+        result = []
+        for node in self.node_order:
+            if any(dep in affected for dep in self.nodes[node][0]):
+                affected.add(node)
+                result.append(node)
+        return result
+
+
+_loaded_rules = {}
+
+
+def load_rules(file_path):
+    # Reads and compiles a rules file; unchanged files come from the cache
+    file_path = os.path.abspath(file_path)
+    stamp = os.stat(file_path).st_mtime_ns
+    cached = _loaded_rules.get(file_path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    with open(file_path, 'r') as file:
+        data = json.load(file)
+    rules = RuleSet(data["formulas"], data.get("name") or os.path.basename(file_path))
+    _loaded_rules[file_path] = (stamp, rules)
+    return rules
+
+
+STANDARD_RULES = load_rules(STANDARD_RULES_PATH)
+_active_rules = STANDARD_RULES
+
+
+def active_rules():
+    return _active_rules
+
+
+def use_rules(rules=None):
+    # Makes rules (a RuleSet, a rules file path or None for the standard
+    # rules) the default for calculate(), compute_stats() and new StatGraphs
+    global _active_rules
+    if rules is None:
+        rules = STANDARD_RULES
+    elif not isinstance(rules, RuleSet):
+        rules = load_rules(rules)
+    _active_rules = rules
+    return rules
+
+
+def calculate(inputs, rules=None):
+    # Returns every calculated value of a sheet as a flat dict of ints.
+    # Raises ValueError/KeyError on bad input, like the form always has.
+    rules = rules or _active_rules
+    nodes = rules.nodes
+    values = dict(inputs)
+    for node in rules.node_order:
+        deps, formula = nodes[node]
+        values[node] = formula(*[values.get(dep) for dep in deps])
+    return {key: values[key] for key in OUTPUT_KEYS}
+
+
+_MISSING = object()
+
+
+class StatGraph:
+    """Incremental version of calculate() for a single open sheet.
+
+    update() takes the input fields that changed and re-evaluates only the
+    nodes downstream of them, returning just the outputs whose value moved.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = rules or _active_rules
+        self.values = {}
+        # Inputs whose last propagation failed and must be retried
+        self._stale = set()
+        # Changed inputs read by the node that failed the last update
+        self.error_fields = ()
+
+    def set_rules(self, rules):
+        # Switches rule sets; the next update() recalculates everything
+        self.rules = rules
+        self.values = {key: value for key, value in self.values.items() if key in KNOWN_INPUTS}
+        self._stale = set(self.values)
+
+    def update(self, changes):
+        changed = self._stale.copy()
+        for key, value in changes.items():
+            if key not in self.values or self.values[key] != value:
+                self.values[key] = value
+                changed.add(key)
+        if not changed:
+            return {}
+
+        rules = self.rules
+        if len(changed) == 1:
+            nodes = rules.downstream.get(next(iter(changed))) or rules.downstream_of(changed)
+        else:
+            nodes = rules.downstream_of(changed)
+
+        # Evaluate into a scratch dict so a bad input leaves the graph consistent
+        pending = {}
+        moved = set(changed)
+        try:
+            for node in nodes:
+                deps, formula = rules.nodes[node]
+                if not any(dep in moved for dep in deps):
+                    continue
+                value = formula(*[pending[dep] if dep in pending else self.values.get(dep) for dep in deps])
+                if self.values.get(node, _MISSING) != value:
+                    pending[node] = value
+                    moved.add(node)
+        except Exception:
+            self._stale = changed
+            self.error_fields = tuple(dep for dep in deps if dep in changed) or (node,)
+            raise
+
+        self._stale = set()
+        self.error_fields = ()
+        self.values.update(pending)
+        return {key: value for key, value in pending.items() if key in OUTPUT_SET}
+
+
+def compute_stats(character, rules=None):
+    # Convenience wrapper: character dict in, calculated values out
+    return calculate(character_inputs(character), rules)
+
+
+def character_columns(characters):
+    # Turns a list of character dicts into the column layout calculate_batch() expects
+    rows = [character_inputs(character) for character in characters]
+    if not rows:
+        return {}
+    return {key: [row[key] for row in rows] for key in rows[0]}
+
+
+def _int_column(values, count):
+    # Numeric columns pass straight through, string columns get the form's conversion
+    if values is None:
+        return np.zeros(count, dtype=np.int64)
+    column = np.asarray(values)
+    if column.dtype.kind in "iub":
+        return column.astype(np.int64, copy=False)
+    return np.fromiter((to_int(value) for value in column.tolist()), dtype=np.int64, count=count)
+
+
+def _index_column(values, names, size, count):
+    # Row indexes into a rules table: names go through the value table,
+    # integer columns are taken as values; anything unknown -> 0
+    column = np.asarray(values)
+    if column.dtype.kind in "iu":
+        column = column.astype(np.int64, copy=False)
+        return np.where((column > 0) & (column < size), column, 0)
+    return np.fromiter((names.get(value, 0) for value in column.tolist()), dtype=np.int64, count=count)
+
+
+def _load_numpy():
+    # Importing NumPy takes far longer than the rest of this module, and
+    # only calculate_batch() needs it, so the GUI and the CLI workers
+    # don't pay for it unless they batch
+    global np, _STAGE_ARRAYS, _SIZE_ARRAY
+    if np is not None:
+        return
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("calculate_batch requires NumPy") from None
+    # Rules tables as arrays, one row per stage/size value (row 0 = unknown)
+    _STAGE_ARRAYS = {field: numpy.array([getattr(rules, field) for rules in STAGE_TABLE], dtype=numpy.int64)
+                     for field in STAGE_TABLE[0]._fields}
+    _SIZE_ARRAY = numpy.array(SIZE_TABLE, dtype=numpy.int64)
+    np = numpy
+
+
+def _calculate_rows(columns, count, rules):
+    # calculate_batch() for rule sets other than the standard one: row by
+    # row through the compiled formulas, numeric stages/sizes turned back into names
+    names = {"stage": STAGES, "size": SIZES}
+    rows = [{} for _ in range(count)]
+    for key, values in columns.items():
+        for row, value in zip(rows, values.tolist() if hasattr(values, "tolist") else values):
+            if key in names and isinstance(value, int) and 0 < value <= len(names[key]):
+                value = names[key][value - 1]
+            row[key] = value
+    results = [calculate(row, rules) for row in rows]
+    return {key: np.array([result[key] for result in results], dtype=np.int64) for key in OUTPUT_KEYS}
+
+
+def calculate_batch(columns, rules=None):
+    # Vectorised calculate(): takes a dict of input columns (same keys as
+    # calculate(), one entry per character) and returns a dict of int64 arrays.
+    # Stage and size columns may hold names or their numeric values.
+    # Only the standard rules are vectorised; house rules run row by row.
+    _load_numpy()
+
+    count = len(next(iter(columns.values()))) if columns else 0
+    rules = rules or _active_rules
+    if rules.formulas != STANDARD_RULES.formulas:
+        return _calculate_rows(columns, count, rules)
+    stage_index = _index_column(columns.get("stage", ["Child"] * count), STAGE_VALUES, len(STAGE_TABLE), count)
+    size_index = _index_column(columns.get("size", ["Medium"] * count), SIZE_VALUES, len(SIZE_TABLE), count)
+    stage = {field: values[stage_index] for field, values in _STAGE_ARRAYS.items()}
+    stage_value = stage["value"]
+    size_bonus = _SIZE_ARRAY[size_index]
+
+    def column(key):
+        return _int_column(columns.get(key), count)
+
+    results = {}
+
+    # Primary stats
+    for stat in STAT_KEYS:
+        results[stat] = stage_value + column(f"{stat}_dp") + column(f"{stat}_bonus")
+
+    # Derived stats ignore quality bonuses on the primary stat
+    derived_sources = [("bit", "acc"), ("dos", "dam"), ("ram", "dod"), ("cpu", "arm")]
+    for i, (derived, stat) in enumerate(derived_sources):
+        base = results[stat] - column(f"{stat}_bonus")
+        results[derived] = (np.maximum(1, np.floor_divide(base, 3))
+                            + column(f"{derived}_bonus") + size_bonus[:, i])
+
+    # Health and battery
+    results["max_health"] = (results["hp"] * 2) + stage["health"] - column("hp_bonus")
+    results["max_batt"] = stage["battery"]
+
+    # Misc stats
+    results["move"] = stage["movement"] + column("move_bonus")
+    results["init"] = results["ram"] + column("init_bonus")
+    results["range"] = results["bit"] + 3 + column("range_bonus")
+    results["max_range"] = results["range"] + stage["range"] + column("max_range_bonus")
+
+    # DP totals
+    results["stat_spent"] = sum(column(f"{stat}_dp") for stat in STAT_KEYS)
+    results["dp_spent"] = results["stat_spent"] + column("quality_spent")
+    results["dp_allocated"] = stage["dp_budget"] + column("bonus_dp")
+
+    return results
@@ -0,0 +1,181 @@
+"""Opt-in tracing of Tk callbacks, saved as Chrome trace JSON.
+
+While tracing is on, every Python callback Tk runs (variable traces, event
+bindings such as combobox selects, menu and button commands, after() jobs)
+is recorded as a span with its start time and duration, alongside spans
+for app functions marked with @traced. The result opens in chrome://tracing
+or https://ui.perfetto.dev, where nested spans show the whole handler chain
+behind a single edit.
+
+tkinter binds each callback to CallWrapper.__call__ when it registers it,
+so this module replaces that method once, at import, before the app
+creates any widgets. Callbacks registered before the import are not
+recorded. When tracing is off the replacement only checks a flag before
+calling the original, which is a small constant cost per callback. Start
+tracing from Help > Record Trace, or for a whole session with
+
+    DIGIMON_TRACE=trace.json python digimon_2e_latest_version.py
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tkinter as tk
+
+# after() wrappers whose span is named after the callback they run
+_AFTER_WRAPPERS = {
+    "Misc.after.<locals>.callit",
+    "SheetLifecycle.after.<locals>.run",
+    "SheetLifecycle.after_idle.<locals>.run",
+}
+_TRACE_MODES = {"write", "read", "unset", "array"}
+# Positions of %W and %T in the fields tkinter substitutes into bindings
+_EVENT_WIDGET = 14
+_EVENT_TYPE = 15
+
+# tkinter's own CallWrapper.__call__; never cleared, since every callback
+# registered after the import goes through _traced_call for good
+_original_call = tk.CallWrapper.__call__
+
+
+def _unwrap_after(func):
+    # The callback an after() wrapper closes over
+    for cell in func.__closure__ or ():
+        value = cell.cell_contents
+        if callable(value) and not isinstance(value, (tk.Misc, type)):
+            return value
+    return func
+
+
+def callback_name(func):
+    target = getattr(func, "__func__", func)
+    name = getattr(target, "__qualname__", None) or repr(func)
+    code = getattr(target, "__code__", None)
+    if code is not None and "<" in name:
+        # Lambdas and local functions are told apart by their line
+        name += f":{code.co_firstlineno}"
+    return name
+
+
+class Tracer:
+    def __init__(self, max_events=500000):
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        self.enabled = False
+        self._epoch = time.perf_counter()
+
+    def start(self):
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def clear(self):
+        self.events = []
+        self.dropped = 0
+
+    def add_span(self, name, category, started, args=None):
+        # started: time.perf_counter() at the start of the span
+        if len(self.events) >= self.max_events:
+            self.dropped += 1
+            return
+        ended = time.perf_counter()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (started - self._epoch) * 1e6,
+            "dur": (ended - started) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def span(self, name, category="app", args=None):
+        return _Span(self, name, category, args)
+
+    def _call(self, wrapper, args):
+        func = wrapper.func
+        name = callback_name(func)
+        span_args = None
+        if wrapper.subst:
+            category = "event"
+            if len(args) > _EVENT_TYPE:
+                try:
+                    event_type = tk.EventType(args[_EVENT_TYPE]).name
+                except ValueError:
+                    event_type = args[_EVENT_TYPE]
+                span_args = {"event": event_type, "widget": args[_EVENT_WIDGET]}
+        elif name.rsplit(":", 1)[0] in _AFTER_WRAPPERS:
+            category = "after"
+            inner = _unwrap_after(func)
+            if callback_name(inner).rsplit(":", 1)[0] in _AFTER_WRAPPERS:
+                inner = _unwrap_after(inner)
+            name = callback_name(inner)
+        elif len(args) == 3 and args[2] in _TRACE_MODES:
+            category = "trace"
+            span_args = {"var": args[0], "mode": args[2]}
+        else:
+            category = "command"
+
+        started = time.perf_counter()
+        try:
+            return _original_call(wrapper, *args)
+        finally:
+            self.add_span(name, category, started, span_args)
+
+    def to_json(self):
+        return {
+            "traceEvents": self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": self.dropped},
+        }
+
+    def save(self, file_path):
+        with open(file_path, 'w') as file:
+            json.dump(self.to_json(), file)
+
+
+class _Span:
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.add_span(self.name, self.category, self.started, self.args)
+        return False
+
+
+tracer = Tracer()
+
+
+def _traced_call(wrapper, *args):
+    if not tracer.enabled:
+        return _original_call(wrapper, *args)
+    return tracer._call(wrapper, args)
+
+
+tk.CallWrapper.__call__ = _traced_call
+
+
+def traced(name, category="app"):
+    # Records calls of the decorated function as spans while tracing is on
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate